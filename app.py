@@ -1,11 +1,12 @@
 import streamlit as st
 from datetime import date, timedelta
-import time
 
 from src.utils.file_utils import load_custom_css
-from src.utils.chrome_utils import get_chrome_driver, save_cookies, URL
-from src.utils.log_utils import log, show_log
-from src.utils.scraping_utils import run_all_scraper
+from src.utils.chrome_utils import LoginRequiredError, get_chrome_driver, save_cookies, wait_for_login, URL
+from src.utils.driver_pool_utils import get_driver_pool
+from src.utils.log_utils import log, show_log, missing_dates
+from src.utils.network_capture_utils import date_split_widgets
+from src.utils.scraping_utils import available_engines, run_all_scraper
 
 # config
 st.set_page_config(
@@ -48,6 +49,34 @@ def main():
         end_date = st.date_input(
             "Enddatum", date.today() - timedelta(days=1), key="end"
         )
+        workers = st.number_input(
+            "Parallele Browser", min_value=1, max_value=8, value=1, step=1, key="workers"
+        )
+        planned = missing_dates(start_date, end_date)
+        st.caption(
+            f"🗓️ {len(planned)} von {max((end_date - start_date).days + 1, 0)} Tagen noch nicht extrahiert."
+        )
+        engine = st.radio(
+            "Scraping-Modus",
+            available_engines(),
+            format_func=lambda e: {
+                "dom": "Tabellen auslesen",
+                "network": "Netzwerk-Mitschnitt",
+                "export": "CSV-Export",
+            }[e],
+            horizontal=True,
+            key="engine",
+        )
+        range_days = 1
+        if engine == "network" and date_split_widgets():
+            range_days = st.selectbox(
+                "Tage pro Auswahl (Netzwerk-Mitschnitt)",
+                [1, 7, 31],
+                format_func=lambda n: "Einzeltage" if n == 1 else ("Woche" if n == 7 else "Monat"),
+                key="range_days",
+            )
+        headless = st.checkbox("Browser unsichtbar (headless)", value=True, key="headless")
+        record = st.checkbox("Seiten für Offline-Replay aufzeichnen", value=False, key="record")
 
     with col2:
         st.markdown("### 📜 Log-Fenster")
@@ -55,22 +84,34 @@ def main():
 
     with col1:
         if st.button("🔄 Einmaliger Login"):
+            # Wartende Browser halten das Profil offen
+            get_driver_pool().shutdown()
             driver = get_chrome_driver()
             driver.get(URL)
             log(
-                "🔐 Bitte im neuen Tab bei Google anmelden. Danach das Google-Tab schließen.",
+                "🔐 Bitte im neuen Fenster bei Google anmelden. Es schließt sich, sobald die Anmeldung erkannt ist.",
                 "info",
             )
-            time.sleep(60)
-            save_cookies(driver)
+            if wait_for_login(driver):
+                save_cookies(driver)
+                log("✅ Anmeldung erkannt – Sitzung im Chrome-Profil gespeichert.", "info")
+            else:
+                log("⚠️ Keine Anmeldung innerhalb von 5 Minuten erkannt.", "warning")
             driver.quit()
-            log("✅ Cookies erfolgreich gespeichert.", "info")
             # show_log(log_container)
 
         if st.button("🚀 Scraper ausführen"):
-            run_all_scraper(start_date, end_date, log_container)
+            try:
+                run_all_scraper(start_date, end_date, log_container, workers=int(workers), engine=engine, record=record, range_days=int(range_days), headless=headless)
+            except LoginRequiredError as e:
+                st.warning(str(e))
+                st.stop()
             st.session_state["log_messages"].append(" ")
 
+        if st.button("🧹 Wartende Browser schließen"):
+            get_driver_pool().shutdown()
+            log("✅ Wartende Browser geschlossen.", "info")
+
     show_log(log_container)
     log_html = '<div id="log-container">' + "<br>".join(st.session_state["log_messages"]) + '</div>'
     log_container.markdown(log_html, unsafe_allow_html=True)
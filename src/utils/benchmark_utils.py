@@ -0,0 +1,185 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+from datetime import date
+
+from src.utils.file_utils import get_output_folder
+from src.utils.page_snapshot_utils import PageSnapshot
+from src.utils.replay_utils import FIXTURE_DIR, ReplayDriver, list_fixtures, synthetic_recording
+from src.utils.table_engine_utils import TABLE_SPECS, scrape_table
+from src.utils.scraper.user_behaviors_scraper import extract_user_behaviour
+from src.utils.scraper.where_new_visitors_come_from_chart import extract_table_for_piechart_gviz as extract_pie_sources
+from src.utils.scraper.what_devices_used_chart import extract_table_for_piechart_gviz as extract_pie_devices
+from src.utils.scraper.who_was_visiting_chart import extract_table_for_piechart_gviz as extract_pie_visitors
+
+
+# ========== Offline-Benchmark der Extractors ==========
+#
+# Spielt aufgezeichnete (oder aus den Rohdaten erzeugte) Tage über den
+# ReplayDriver ab und misst Zeilen pro Sekunde je Extractor.
+#
+#   python -m src.utils.benchmark_utils                 # Fixtures aus src/data/fixtures
+#   python -m src.utils.benchmark_utils --synthetic 30  # 30 Tage aus src/data/raw
+#   python -m src.utils.benchmark_utils --check         # Zeilen + Zeitgrenze prüfen (Exit 1)
+#
+# Dieselben Prüfungen laufen als pytest in tests/test_replay_extractors.py.
+
+# Zeitgrenze je Extractor und Tag (Replay, ohne Browser)
+MAX_MS_PER_DAY = 50
+
+# Sollwerte des gemeinsamen Snapshots: die drei Kreisdiagramme hintereinander
+COMBINED_EXPECTATIONS = {
+    "piecharts_shared_snapshot": [
+        "where_new_visitors_come_from_chart", "what_devices_used_chart", "who_was_visiting_chart",
+    ],
+}
+
+EXTRACTORS = {
+    **{
+        widget: lambda d, day, spec=spec: scrape_table(d, spec, day.isoformat())
+        for widget, spec in TABLE_SPECS.items()
+    },
+    "user_behaviors": lambda d, day: [row] if (row := extract_user_behaviour(d, day)) else [],
+    "where_new_visitors_come_from_chart": lambda d, day: extract_pie_sources(d, day.isoformat()),
+    "what_devices_used_chart": lambda d, day: extract_pie_devices(d, day.isoformat()),
+    "who_was_visiting_chart": lambda d, day: extract_pie_visitors(d, day.isoformat()),
+    "piecharts_shared_snapshot": lambda d, day: [
+        row
+        for func in (extract_pie_sources, extract_pie_devices, extract_pie_visitors)
+        for row in func(d, day.isoformat(), snapshot=snapshot)
+    ] if (snapshot := PageSnapshot(d)) else [],
+}
+
+
+def benchmark_extractors(recordings: dict, rounds: int = 3, extractors: dict = None) -> list:
+    """
+    recordings — {datum: Aufzeichnung}
+    Gibt pro Extractor {"extractor", "rows", "seconds", "rows_per_second"} zurück.
+    """
+    results = []
+    for name, extract in (extractors or EXTRACTORS).items():
+        rows = 0
+        seconds = 0.0
+        for _ in range(rounds):
+            for day, recording in recordings.items():
+                started = time.perf_counter()
+                data = run_extractor(extract, recording, day)
+                seconds += time.perf_counter() - started
+                rows += len(data)
+        results.append({
+            "extractor": name,
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds else 0.0,
+        })
+    return results
+
+
+def run_extractor(extract, recording: dict, day) -> list:
+    """Ein Extractor auf einer Aufzeichnung (Konsolenausgaben verworfen)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return extract(ReplayDriver(recording), day)
+
+
+def expected_rows(recording: dict, extractor: str):
+    """Die aufgezeichneten Zeilen für den Extractor oder None, wenn keine vorliegen."""
+    recorded = recording.get("rows") or {}
+    widgets = COMBINED_EXPECTATIONS.get(extractor, [extractor])
+    if not all(widget in recorded for widget in widgets):
+        return None
+    return [row for widget in widgets for row in recorded[widget]]
+
+
+def _as_text(rows: list) -> list:
+    return [{key: "" if value is None else str(value) for key, value in row.items()} for row in rows]
+
+
+def check_extractors(recordings: dict, extractors: dict = None) -> list:
+    """
+    Vergleicht die Zeilen jedes Extractors mit den aufgezeichneten Zeilen.
+    Gibt die Abweichungen als Texte zurück (leer = alles gleich).
+    """
+    problems = []
+    for name, extract in (extractors or EXTRACTORS).items():
+        for day, recording in recordings.items():
+            expected = expected_rows(recording, name)
+            if expected is None:
+                continue
+            actual = _as_text(run_extractor(extract, recording, day))
+            if actual != _as_text(expected):
+                problems.append(
+                    f"{name} {day.isoformat()}: {len(actual)} Zeilen statt {len(expected)} "
+                    f"oder abweichende Werte"
+                )
+    return problems
+
+
+def slow_extractors(results: list, days: int, rounds: int, limit_ms: float = MAX_MS_PER_DAY) -> list:
+    """Extractors, die im Mittel länger als `limit_ms` pro Tag brauchen."""
+    runs = max(days * rounds, 1)
+    return [
+        f"{result['extractor']}: {result['seconds'] * 1000 / runs:.1f} ms pro Tag (Grenze {limit_ms} ms)"
+        for result in results
+        if result["seconds"] * 1000 / runs > limit_ms
+    ]
+
+
+def load_recordings(fixture_dir: str = FIXTURE_DIR, synthetic_days: int = 0) -> dict:
+    """
+    Lädt die aufgezeichneten Fixtures oder erzeugt `synthetic_days` Tage aus
+    den Rohdaten (die jüngsten Tage mit Landingpage-Daten).
+    """
+    if synthetic_days:
+        raw_folder = get_output_folder("raw")
+        days = _recent_raw_days(raw_folder, synthetic_days)
+        return {day: synthetic_recording(day, raw_folder) for day in days}
+    return {
+        date.fromisoformat(iso): ReplayDriver.load(date.fromisoformat(iso), fixture_dir).recording
+        for iso in list_fixtures(fixture_dir)
+    }
+
+
+def _recent_raw_days(raw_folder: str, count: int) -> list:
+    with open(os.path.join(raw_folder, "landingpage.csv"), encoding="utf-8-sig") as f:
+        next(f, None)
+        days = sorted({line.split(";", 1)[0] for line in f if line.strip()})
+    return [date.fromisoformat(day) for day in days[-count:]]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline-Benchmark der Scraper-Extractors")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="Ordner mit aufgezeichneten Tagen")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="TAGE",
+                        help="statt Fixtures N Tage aus den Rohdaten erzeugen")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--check", action="store_true",
+                        help="Zeilen mit den Aufzeichnungen vergleichen und Zeitgrenze prüfen")
+    args = parser.parse_args(argv)
+
+    recordings = load_recordings(args.fixtures, args.synthetic)
+    if not recordings:
+        print("❌ Keine Fixtures gefunden – erst mit record=True scrapen oder --synthetic nutzen.")
+        return 1
+
+    print(f"📦 {len(recordings)} Tage × {args.rounds} Runden")
+    results = benchmark_extractors(recordings, rounds=args.rounds)
+    for result in results:
+        print(
+            f"{result['extractor']:<36} {result['rows']:>7} Zeilen "
+            f"{result['seconds'] * 1000:>9.1f} ms {result['rows_per_second']:>12.0f} Zeilen/s"
+        )
+    if not args.check:
+        return 0
+
+    problems = check_extractors(recordings) + slow_extractors(results, len(recordings), args.rounds)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✅ Alle Extractors liefern die aufgezeichneten Zeilen innerhalb der Zeitgrenze.")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
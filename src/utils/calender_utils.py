@@ -1,7 +1,10 @@
+import weakref
 from datetime import date
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from src.utils.timing_utils import span
 
 
 # ========== Kalenderhilfen ==========
@@ -50,36 +53,126 @@ def get_current_year_month(cal_panel):
     return int(year_str), GERMAN_FULL_UPPER[month_str]
 
 
+PERIOD_BUTTON = (By.CSS_SELECTOR, ".mat-calendar-period-button")
+BODY_CELL = (By.CSS_SELECTOR, "button.mat-calendar-body-cell")
+
+# Zuletzt angezeigter Monat pro Treiber und Kalender (0 = Start, 1 = Ende).
+# Bei aufeinanderfolgenden Tagen im selben Monat entfällt so jede Navigation.
+# Nach jedem Neuladen der Seite gilt der Stand nicht mehr (forget_displayed_months).
+_DISPLAYED_MONTHS = weakref.WeakKeyDictionary()
+
+# So oft wird das 24-Jahre-Fenster der Mehrjahresansicht höchstens verschoben
+MAX_YEAR_PAGES = 4
+
+
+def forget_displayed_months(driver) -> None:
+    """Verwirft die gemerkten Kalendermonate, z. B. nach driver.get(URL)."""
+    _DISPLAYED_MONTHS.pop(driver, None)
+
+
+def _displayed_year_month(cal_panel):
+    """Wie get_current_year_month, aber None außerhalb der Monatsansicht."""
+    try:
+        return get_current_year_month(cal_panel)
+    except (KeyError, ValueError):
+        return None
+
+
+def _find_cell(cal_panel, matches):
+    for cell in cal_panel.find_elements(*BODY_CELL):
+        if matches(cell.text.strip().upper().rstrip("."), (cell.get_attribute("aria-label") or "").strip()):
+            return cell
+    return None
+
+
+def jump_to_month(cal_panel, year: int, month: int, wait: WebDriverWait):
+    """
+    Springt über die Perioden-Schaltfläche direkt zum Monat:
+    Monatsansicht → Mehrjahresansicht → Jahr → Monat (drei Klicks).
+    Wirft LookupError, wenn Jahr oder Monat nicht angeboten werden.
+    """
+    def visible_years():
+        texts = [cell.text.strip() for cell in cal_panel.find_elements(*BODY_CELL)]
+        return [int(text) for text in texts if len(text) == 4 and text.isdigit()]
+
+    cal_panel.find_element(*PERIOD_BUTTON).click()
+    years = wait.until(lambda d: visible_years())
+    for _ in range(MAX_YEAR_PAGES):
+        if year in years:
+            break
+        # Jahr liegt außerhalb des 24-Jahre-Fensters: Fenster weiterschieben
+        direction = "previous" if year < min(years) else "next"
+        cal_panel.find_element(By.CSS_SELECTOR, f"button.mat-calendar-{direction}-button").click()
+        shown = years
+        years = wait.until(lambda d: (lambda now: now if now and now != shown else False)(visible_years()))
+    # Auch nach der letzten Verschiebung noch einmal prüfen
+    if year not in years:
+        raise LookupError(f"Jahr {year} nicht in der Mehrjahresansicht")
+    _find_cell(cal_panel, lambda text, aria: text == str(year)).click()
+
+    month_text = GERMAN_MONTHS[month].rstrip(".")
+    month_names = {GERMAN_MONTHS_FOR_DAYS_BUTTON[month].rstrip("."), date(year, month, 1).strftime("%B")}
+
+    def month_matches(text, aria):
+        return text == month_text or any(aria.startswith(name) and str(year) in aria for name in month_names)
+
+    wait.until(lambda d: _find_cell(cal_panel, month_matches) is not None)
+    _find_cell(cal_panel, month_matches).click()
+    wait.until(lambda d: get_current_year_month(cal_panel) == (year, month))
+
+
 def select_date_range(driver, start: date, end: date):
     wait = WebDriverWait(driver, 10)
     wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.canvas-date-input"))).click()
     calendars = wait.until(EC.visibility_of_all_elements_located((By.CSS_SELECTOR, ".mat-calendar")))
     start_cal, end_cal = calendars
+    displayed = _DISPLAYED_MONTHS.setdefault(driver, {})
 
     def click_until(direction: str, cal_panel, target_header):
         btn = cal_panel.find_element(By.CSS_SELECTOR, f"button.mat-calendar-{direction}-button")
-        header_sel = (By.CSS_SELECTOR, ".mat-calendar-period-button")
         for _ in range(48):
-            header = cal_panel.find_element(*header_sel).text.strip().upper()
+            header = cal_panel.find_element(*PERIOD_BUTTON).text.strip().upper()
             if header == target_header:
                 return
             btn.click()
-            wait.until(lambda d: cal_panel.find_element(*header_sel).text.strip().upper() != header)
-
-    start_header = f"{GERMAN_MONTHS[start.month]} {start.year}"
-    end_header = f"{GERMAN_MONTHS[end.month]} {end.year}"
-
-    if get_current_year_month(start_cal) < (start.year, start.month):
-        click_until("next", start_cal, start_header)
-    else:
-        click_until("previous", start_cal, start_header)
+            wait.until(lambda d: cal_panel.find_element(*PERIOD_BUTTON).text.strip().upper() != header)
 
-    if get_current_year_month(end_cal) < (end.year, end.month):
-        click_until("next", end_cal, end_header)
-    else:
-        click_until("previous", end_cal, end_header)
-
-    click_day_button(start_cal, start, wait)
-    click_day_button(end_cal, end, wait)
+    def navigate(slot: int, cal_panel, target: date, trust_cache: bool = True):
+        target_ym = (target.year, target.month)
+        if trust_cache and displayed.get(slot) == target_ym:
+            return
+        current = get_current_year_month(cal_panel)
+        distance = abs((current[0] - target.year) * 12 + current[1] - target.month)
+        if distance > 2:
+            try:
+                jump_to_month(cal_panel, target.year, target.month, wait)
+                current = target_ym
+            except (LookupError, TimeoutException):
+                # Zurück in die Monatsansicht und klassisch weiterblättern
+                if _displayed_year_month(cal_panel) is None:
+                    cal_panel.find_element(*PERIOD_BUTTON).click()
+                    wait.until(lambda d: _displayed_year_month(cal_panel) is not None)
+                current = get_current_year_month(cal_panel)
+        if current != target_ym:
+            # Nahe Monate (oder Fallback): mit den Pfeilen blättern
+            header = f"{GERMAN_MONTHS[target.month]} {target.year}"
+            click_until("next" if current < target_ym else "previous", cal_panel, header)
+        displayed[slot] = target_ym
+
+    def pick_day(slot: int, cal_panel, target: date):
+        try:
+            click_day_button(cal_panel, target, wait)
+        except RuntimeError:
+            # Gemerkter Monat stimmte nicht – neu navigieren und nochmal
+            navigate(slot, cal_panel, target, trust_cache=False)
+            click_day_button(cal_panel, target, wait)
+
+    with span("calendar_navigate"):
+        navigate(0, start_cal, start)
+        navigate(1, end_cal, end)
+
+    with span("calendar_pick_day"):
+        pick_day(0, start_cal, start)
+        pick_day(1, end_cal, end)
 
     wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.apply-button"))).click()
@@ -0,0 +1,57 @@
+import csv
+import os
+import threading
+
+
+# ========== Checkpoints pro (Datum, Widget) ==========
+#
+# Jedes erfolgreich gespeicherte Widget eines Tages wird vermerkt. Bricht ein
+# Tag ab, holt der nächste Lauf nur noch die fehlenden Widgets nach.
+
+CHECKPOINT_PATH = os.path.join("src", "data", "log", "widget_checkpoints.csv")
+
+# Eintrag statt eines Widgets: Der Bericht hatte für den Tag keine Daten
+EMPTY_DAY = "keine_daten"
+
+
+class CheckpointStore:
+    def __init__(self, file_path: str = CHECKPOINT_PATH):
+        """
+        file_path — CSV mit den Spalten Datum, Widget (wird einmal geladen)
+        """
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._done = set()
+        if os.path.exists(file_path):
+            with open(file_path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for row in reader:
+                    if len(row) >= 2:
+                        self._done.add((row[0], row[1]))
+
+    def is_done(self, scrape_date, widget: str) -> bool:
+        """O(1)-Prüfung, ob das Widget für den Tag schon gespeichert ist."""
+        return (scrape_date.isoformat(), widget) in self._done
+
+    def pending(self, scrape_date, widgets) -> list:
+        """Die Widgets, die für den Tag noch fehlen (Reihenfolge bleibt)."""
+        return [w for w in widgets if not self.is_done(scrape_date, w)]
+
+    def mark_done(self, scrape_date, widget: str) -> None:
+        key = (scrape_date.isoformat(), widget)
+        with self._lock:
+            if key in self._done:
+                return
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            file_exists = os.path.exists(self.file_path)
+            with open(self.file_path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if not file_exists:
+                    writer.writerow(["Datum", "Widget"])
+                writer.writerow(list(key))
+            self._done.add(key)
+
+    def mark_empty(self, scrape_date) -> None:
+        """Vermerkt den Tag ausdrücklich als leer (keine Widgets gescrapt)."""
+        self.mark_done(scrape_date, EMPTY_DAY)
@@ -1,11 +1,15 @@
 import os
 import pickle
+import shutil
+import subprocess
 import time
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from subprocess import CREATE_NO_WINDOW
 from src.utils.file_utils import resource_path
+from src.utils.export_utils import remove_download_dir
+from src.utils.network_capture_utils import enable_performance_logging
+from src.utils.readiness_utils import wait_for_dashboard_ready, wait_for_process_exit
 
 def ensure_cookie_dir(folder_name: str = "cookies") -> Path:
     base_dir = os.path.abspath(".")
@@ -17,33 +21,199 @@ COOKIE_DIR = ensure_cookie_dir()
 COOKIE_PATH = COOKIE_DIR / "cookies.pkl"
 URL = "https://lookerstudio.google.com/u/0/reporting/3c1fa903-4f31-4e6f-9b54-f4c6597ffb74/page/4okDC"
 
-def get_chrome_driver() -> webdriver.Chrome:
-    chrome_path = resource_path("chromedriver.exe")
-    service = Service(executable_path=chrome_path)
-    service.creationflags = CREATE_NO_WINDOW
+# Dauerhaftes Chrome-Profil (--user-data-dir): Die Google-Sitzung bleibt darin
+# gespeichert, ein Warmstart lädt den Bericht nur einmal. Parallele Browser
+# bekommen eine Kopie, weil Chrome ein Profil nur für eine Instanz öffnet.
+PROFILE_DIR = Path(os.path.abspath(".")) / "chrome_profile"
+# Sperrdateien laufender Instanzen (Chrome selbst und LevelDB-Datenbanken)
+PROFILE_LOCK_FILES = ("Singleton*", "lockfile", "LOCK", "*.lock")
+
+# Google-Anmeldecookies, an denen eine gültige Sitzung erkannt wird
+AUTH_COOKIES = ("SID", "__Secure-1PSID", "__Secure-3PSID")
+LOGIN_HOST = "accounts.google.com"
+
+class LoginRequiredError(RuntimeError):
+    """Keine gültige Google-Sitzung – einmal über die App anmelden."""
+
+def profile_dir(slot: int = 0) -> Path:
+    """Profilordner für Browser `slot` (0 = Hauptprofil)."""
+    return PROFILE_DIR if slot == 0 else PROFILE_DIR.with_name(f"{PROFILE_DIR.name}_{slot}")
+
+def profile_in_use(slot: int = 0) -> bool:
+    """
+    Prüft, ob ein Chrome-Prozess das Profil von `slot` geöffnet hat:
+    unter Linux/macOS über den SingletonLock-Link ("host-pid"), unter
+    Windows über die exklusiv geöffnete Datei "lockfile".
+    """
+    folder = profile_dir(slot)
+    try:
+        target = os.readlink(folder / "SingletonLock")
+    except OSError:
+        target = None
+    if target is not None:
+        try:
+            os.kill(int(target.rsplit("-", 1)[-1]), 0)
+        except (ValueError, ProcessLookupError):
+            return False  # verwaister Link nach einem Absturz
+        except PermissionError:
+            return True
+        return True
+    lockfile = folder / "lockfile"
+    if os.name == "nt" and lockfile.exists():
+        try:
+            with open(lockfile, "a"):
+                return False
+        except PermissionError:
+            return True
+    return False
+
+def sync_worker_profiles(count: int, skip=()) -> bool:
+    """
+    Kopiert das Hauptprofil für die parallelen Browser 1 … count-1
+    (außer den Slots in `skip`, deren Profil noch geöffnet ist).
+    Läuft noch ein Browser auf dem Hauptprofil, wird nicht kopiert – die
+    Datenbanken wären mitten im Schreiben; die Rückgabe ist dann False.
+    """
+    if not PROFILE_DIR.exists():
+        return True
+    if profile_in_use(0):
+        print("⚠️ Hauptprofil ist noch geöffnet – Profile der parallelen Browser werden nicht aktualisiert.")
+        return False
+    for slot in range(1, count):
+        if slot in skip:
+            continue
+        target = profile_dir(slot)
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(PROFILE_DIR, target, ignore=shutil.ignore_patterns(*PROFILE_LOCK_FILES))
+    return True
+
+# Scraping-Profil: unsichtbarer Browser mit fester Fenstergröße, der Bilder,
+# Schriften und Tracker gar nicht erst lädt – die Werte stehen im DOM bzw. in
+# den Datenantworten, gerendert werden muss dafür nichts Hübsches.
+WINDOW_SIZE = (1920, 1080)
+HEADLESS_ARGUMENTS = [
+    "--headless=new",
+    f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}",
+    "--disable-gpu",
+    "--mute-audio",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-dev-shm-usage",
+    "--blink-settings=imagesEnabled=false",
+]
+BLOCKED_URL_PATTERNS = [
+    # Bilder
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+    # Schriften
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.gstatic.com*", "*fonts.googleapis.com*",
+    # Analyse und Tracker
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*/gen_204*", "*/log?format=json*", "*play.google.com/log*",
+]
+
+def _chromedriver_service() -> Service:
+    # Mitgelieferter chromedriver (Windows-Bundle), sonst Selenium Manager
+    name = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+    chrome_path = resource_path(name)
+    service = Service(executable_path=chrome_path) if os.path.exists(chrome_path) else Service()
+    if os.name == "nt":
+        service.creationflags = subprocess.CREATE_NO_WINDOW
+    return service
+
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS) -> None:
+    """Blockiert Anfragen auf die URL-Muster per CDP (Network.setBlockedURLs)."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+def get_chrome_driver(capture_network: bool = False, slot: int = 0, headless: bool = False) -> webdriver.Chrome:
+    """
+    Startet Chrome mit dem dauerhaften Profil. Mit headless=True im
+    Scraping-Profil (ohne Fenster, feste Größe, ohne Bilder/Schriften/Tracker);
+    für die Anmeldung bleibt der sichtbare, maximierte Browser.
+    """
     options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    return webdriver.Chrome(service=service, options=options)
+    if headless:
+        for argument in HEADLESS_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument(f"--user-data-dir={profile_dir(slot)}")
+    if capture_network:
+        enable_performance_logging(options)
+    driver = webdriver.Chrome(service=_chromedriver_service(), options=options)
+    if headless:
+        block_resources(driver)
+    return driver
+
+def session_valid(driver) -> bool:
+    """
+    Prüft ohne weiteren Seitenaufruf, ob der Browser angemeldet ist:
+    nicht auf der Google-Anmeldeseite und ein nicht abgelaufenes Auth-Cookie.
+    """
+    try:
+        if LOGIN_HOST in driver.current_url:
+            return False
+        cookies = driver.get_cookies()
+    except Exception:
+        return False
+    now = time.time()
+    return any(
+        cookie.get("name") in AUTH_COOKIES and cookie.get("expiry", now + 1) > now
+        for cookie in cookies
+    )
 
-def init_driver_with_cookies():
-    import streamlit as st
-    driver = get_chrome_driver()
+def wait_for_login(driver, timeout: float = 300, poll: float = 1) -> bool:
+    """
+    Wartet, bis die Anmeldung im geöffneten Browser erkannt wird
+    (höchstens `timeout` Sekunden). Gibt zurück, ob sie erkannt wurde.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if session_valid(driver):
+            return True
+        time.sleep(poll)
+    return False
+
+def _import_legacy_cookies(driver) -> bool:
+    """Übernimmt einmalig die alten Pickle-Cookies ins Profil."""
+    if not COOKIE_PATH.exists():
+        return False
+    with open(COOKIE_PATH, "rb") as f:
+        cookies = pickle.load(f)
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            pass
+    driver.refresh()
+    return session_valid(driver)
+
+def init_driver_with_cookies(capture_network: bool = False, slot: int = 0, headless: bool = True):
+    """
+    Startet den Browser mit dem dauerhaften Profil und öffnet den Bericht.
+    Ist die Sitzung abgelaufen, werden einmalig die alten Cookies versucht;
+    sonst wird LoginRequiredError geworfen.
+    """
+    driver = get_chrome_driver(capture_network=capture_network, slot=slot, headless=headless)
     driver.get(URL)
-    if COOKIE_PATH.exists():
-        with open(COOKIE_PATH, "rb") as f:
-            cookies = pickle.load(f)
-        for cookie in cookies:
-            try:
-                driver.add_cookie(cookie)
-            except:
-                pass
-        driver.refresh()
-        time.sleep(5)
-    else:
-        st.warning("🔐 Bitte anmelden und dann erneut klicken.")
-        st.stop()
+    if not session_valid(driver) and not _import_legacy_cookies(driver):
+        driver.quit()
+        raise LoginRequiredError("🔐 Bitte anmelden und dann erneut klicken.")
+    wait_for_dashboard_ready(driver, timeout=5)
     return driver
 
+def quit_driver(driver, timeout: float = 5):
+    """
+    Beendet den Browser und wartet höchstens `timeout` Sekunden, bis der
+    chromedriver-Prozess wirklich weg ist (statt pauschal zu schlafen).
+    """
+    driver.quit()
+    wait_for_process_exit(driver, timeout=timeout)
+    remove_download_dir(driver)
+
 def save_cookies(driver):
     with open(COOKIE_PATH, "wb") as f:
         pickle.dump(driver.get_cookies(), f)
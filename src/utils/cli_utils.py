@@ -0,0 +1,133 @@
+import argparse
+import contextlib
+import json
+import sys
+from datetime import date, timedelta
+
+from src.utils.chrome_utils import LoginRequiredError
+from src.utils.network_capture_utils import date_split_widgets
+from src.utils.table_engine_utils import TABLE_SPECS
+from src.utils.log_utils import use_console_log
+from src.utils.scraping_utils import WIDGET_NAMES, available_engines, discover_components, run_all_scraper
+
+
+# ========== Scraping ohne Streamlit (cron, systemd-Timer) ==========
+#
+#   python -m src.utils.cli_utils                          # gestern
+#   python -m src.utils.cli_utils --from 2024-01-01 --to 2024-01-31 --workers 2
+#   python -m src.utils.cli_utils --widgets landingpage,user_behaviors
+#   python -m src.utils.cli_utils --discover-components --from 2024-01-15
+#
+# Log-Meldungen gehen nach stderr, die Zusammenfassung als JSON nach stdout.
+# Auch print()-Ausgaben aus Store, Tabellen-Engine, Browser-Pool usw. werden
+# während des Laufs nach stderr umgeleitet – stdout enthält nur das JSON.
+# Aus dem Projektordner starten (relative Pfade zu src/data).
+
+EXIT_OK = 0
+EXIT_FAILED_DAYS = 1  # bzw. Widgets ohne Komponenten-ID bei --discover-components
+EXIT_LOGIN_REQUIRED = 3
+EXIT_ERROR = 4
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Kein Datum im Format JJJJ-MM-TT: {value}")
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Keine ganze Zahl: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Muss mindestens 1 sein: {value}")
+    return number
+
+
+def _parse_widgets(value: str) -> list:
+    widgets = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in widgets if name not in WIDGET_NAMES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"Unbekannte Widgets: {', '.join(unknown)} (verfügbar: {', '.join(WIDGET_NAMES)})"
+        )
+    return widgets
+
+
+def build_parser() -> argparse.ArgumentParser:
+    yesterday = date.today() - timedelta(days=1)
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.cli_utils",
+        description="Scrapt die fehlenden Tage des Looker-Berichts ohne Streamlit-Oberfläche.",
+    )
+    parser.add_argument("--from", dest="start", type=_parse_date, default=yesterday,
+                        help="erster Tag (Standard: gestern)")
+    parser.add_argument("--to", dest="end", type=_parse_date, default=yesterday,
+                        help="letzter Tag (Standard: gestern)")
+    parser.add_argument("--workers", type=_positive_int, default=1, help="parallele Browser (Standard: 1)")
+    parser.add_argument("--widgets", type=_parse_widgets, default=None,
+                        help="nur diese Widgets, kommagetrennt (Standard: alle)")
+    parser.add_argument("--engine", choices=available_engines(), default="dom",
+                        help="Scraping-Modus (Standard: dom)")
+    # Ohne Widget mit Datums-Dimension bleibt der Zeitraum-Modus wirkungslos
+    parser.add_argument("--range-days", type=_positive_int, default=1,
+                        help="Tage pro Datumsauswahl im Netzwerk-Modus (Standard: 1)"
+                        if date_split_widgets() else argparse.SUPPRESS)
+    parser.add_argument("--show-browser", action="store_true", help="Browser sichtbar starten")
+    parser.add_argument("--summary", help="Zusammenfassung zusätzlich als JSON-Datei schreiben")
+    parser.add_argument("--discover-components", action="store_true",
+                        help="nur den Tag --from mitschneiden und Komponenten-IDs für "
+                             "WIDGET_COMPONENTS vorschlagen (keine Rohdaten, Mitschnitt "
+                             "unter src/data/fixtures/components)")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.end < args.start:
+        parser.error("--to liegt vor --from.")
+
+    use_console_log()
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            if args.discover_components:
+                capture = discover_components(args.start, headless=not args.show_browser)
+                matches = capture["matches"]
+                summary = {
+                    "date": capture["date"],
+                    "components": matches,
+                    "date_columns": capture["date_columns"],
+                    "unmatched": [widget for widget in TABLE_SPECS if widget not in matches],
+                }
+            else:
+                summary = run_all_scraper(
+                    args.start,
+                    args.end,
+                    workers=args.workers,
+                    engine=args.engine,
+                    range_days=args.range_days,
+                    headless=not args.show_browser,
+                    widgets=args.widgets,
+                )
+        exit_code = EXIT_FAILED_DAYS if summary.get("failed") or summary.get("unmatched") else EXIT_OK
+    except LoginRequiredError as e:
+        summary = {"error": str(e)}
+        exit_code = EXIT_LOGIN_REQUIRED
+    except Exception as e:
+        summary = {"error": f"{type(e).__name__}: {e}"}
+        exit_code = EXIT_ERROR
+
+    summary["exit_code"] = exit_code
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    print(text)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
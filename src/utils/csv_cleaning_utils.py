@@ -1,5 +1,20 @@
+import csv
+import io
+import json
 import os
 import re
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+from src.utils.normalise_utils import (
+    CLEAN_SCHEMAS,
+    COLUMN_RENAMES,
+    clean_csv_text,
+    normalise_frame,
+    type_errors,
+)
+from src.utils.parquet_utils import append_parquet_dataset, parquet_available, write_parquet_dataset
 
 def prepare_data_paths(base_dir=None):
     if base_dir is None:
@@ -12,6 +27,15 @@ def prepare_data_paths(base_dir=None):
     clean_folder = os.path.normpath(os.path.join(base_dir, "src", "data", "clean"))
     os.makedirs(clean_folder, exist_ok=True)
 
+    # Monatsweise partitionierte Parquet-Datensätze (typisiert)
+    parquet_folder = os.path.normpath(os.path.join(base_dir, "src", "data", "parquet"))
+
+    # Bis wohin die Rohdateien schon aufbereitet sind
+    watermark_path = os.path.normpath(os.path.join(base_dir, "src", "data", "log", "clean_watermarks.json"))
+
+    # Abgewiesene Rohzeilen (Spaltenzahl, Typ) aller Läufe
+    rejection_path = os.path.normpath(os.path.join(base_dir, "src", "data", "log", "clean_rejections.csv"))
+
     file_names = [
         "landingpage.csv",
         "user_behaviors.csv",
@@ -32,19 +56,23 @@ def prepare_data_paths(base_dir=None):
         "who_was_visiting_chart.csv": "daily_visitors_chart.csv",
     }
 
+    # Spaltenzahl je Rohdatei (Semikolon-getrennt, inkl. Datum)
     expected_columns = {
-        "landingpage.csv": 3,
-        "user_behaviors.csv": 3,
-        "what_devices_used_chart.csv": 4,
+        "landingpage.csv": 4,
+        "user_behaviors.csv": 6,
+        "what_devices_used_chart.csv": 3,
         "what_did_user_do.csv": 6,
-        "where_did_they_come_from.csv": 3,
-        "where_new_visitors_come_from_chart.csv": 6,
-        "who_was_visiting_chart.csv": 6,
+        "where_did_they_come_from.csv": 6,
+        "where_new_visitors_come_from_chart.csv": 3,
+        "who_was_visiting_chart.csv": 3,
     }
 
     return {
         "output_folder": output_folder,
         "clean_folder": clean_folder,
+        "parquet_folder": parquet_folder,
+        "watermark_path": watermark_path,
+        "rejection_path": rejection_path,
         "file_names": file_names,
         "final_names": final_names,
         "expected_columns": expected_columns,
@@ -58,30 +86,195 @@ def to_snake_case(col_name):
     return col_name
 
 
-def validate_csv(file_path, expected_cols):
-    problems = []
-    with open(file_path, "r", encoding="utf-8") as f:
-        for i, line in enumerate(f, 1):
-            if line.strip() and len(line.split(",")) != expected_cols:
-                problems.append((i, line.strip()))
-    return problems
+# ========== Prüfen und Kopieren in einem Durchgang ==========
+#
+# Jede Rohzeile wird genau einmal mit dem echten Dialekt (Semikolon, Quotes)
+# gelesen. Zeilen mit falscher Spaltenzahl oder Werten, die nicht zum Typ der
+# Spalte passen, landen nicht in den Clean-Daten, sondern im Abweisungsbericht
+# (src/data/log/clean_rejections.csv) – mit Datei, Zeile, Grund und Wert.
+
+REJECTION_FIELDS = ["lauf", "datei", "zeile", "grund", "spalte", "wert", "erwartet"]
+
+
+def _rejection(raw_fname, line_no, reason, column="", value="", expected=""):
+    return {
+        "datei": raw_fname,
+        "zeile": line_no,
+        "grund": reason,
+        "spalte": column,
+        "wert": value,
+        "erwartet": expected,
+    }
+
+
+def read_validated_rows(text, raw_fname, expected_cols, header=None, first_line_no=0):
+    """
+    Liest Rohzeilen (Semikolon-CSV) und prüft die Spaltenzahl.
+    Ohne `header` ist die erste Zeile die Kopfzeile. Zeilennummern zählen ab
+    `first_line_no` (bereits aufbereitete Zeilen der Datei).
+    Gibt (kopfzeile, zeilen, zeilennummern, abweisungen) zurück.
+    """
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=";")
+    rejections = []
+    if header is None:
+        header = next(reader, [])
+        if len(header) != expected_cols:
+            rejections.append(_rejection(
+                raw_fname, first_line_no + 1, "kopfzeile", value=";".join(header), expected=expected_cols
+            ))
+            return header, [], [], rejections
+
+    rows, line_nos = [], []
+    for row in reader:
+        if not row:
+            continue
+        line_no = first_line_no + reader.line_num
+        if len(row) != expected_cols:
+            rejections.append(_rejection(
+                raw_fname, line_no, "spaltenzahl", value=";".join(row), expected=expected_cols
+            ))
+            continue
+        rows.append(row)
+        line_nos.append(line_no)
+    return header, rows, line_nos, rejections
+
+
+def reject_type_errors(frame, typed, table_name, raw_fname, line_nos):
+    """
+    Entfernt Zeilen mit Werten, die sich nicht typisieren ließen.
+    Gibt (gültige typisierte Zeilen, abweisungen) zurück.
+    """
+    errors = type_errors(frame, typed, table_name)
+    bad = errors.any(axis=1) if not errors.empty else pd.Series(False, index=typed.index)
+    if not bad.any():
+        return typed, []
+
+    kinds = dict(CLEAN_SCHEMAS[table_name])
+    source = frame.rename(columns=COLUMN_RENAMES.get(table_name, {}))
+    rejections = []
+    for position in bad.to_numpy().nonzero()[0]:
+        for column in errors.columns[errors.iloc[position].to_numpy()]:
+            rejections.append(_rejection(
+                raw_fname, line_nos[position], "typ", column, source[column].iloc[position], kinds[column]
+            ))
+    return typed[~bad], rejections
+
+
+def write_rejections(path, rejections, run_started):
+    """Hängt die Abweisungen eines Laufs an den Bericht an."""
+    if not path or not rejections:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    file_exists = os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REJECTION_FIELDS)
+        if not file_exists:
+            writer.writeheader()
+        for rejection in rejections:
+            writer.writerow({"lauf": run_started, **rejection})
+
+
+# ========== Wasserstände: nur neue Rohzeilen aufbereiten ==========
+#
+# Pro Rohdatei wird vermerkt, bis zu welchem Byte sie schon aufbereitet ist
+# (plus letzte Zeile und Kopfzeile als Prüfung). Beim nächsten Lauf werden nur
+# die dahinter angehängten Zeilen gelesen, typisiert und an die Clean-Datei
+# bzw. die betroffenen Parquet-Monate angehängt. Passt der Vermerk nicht mehr
+# (Datei ersetzt/gekürzt, Zeilen geändert), wird die Datei komplett neu
+# aufbereitet.
+
+
+def load_watermarks(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_watermarks(path, watermarks):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(watermarks, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _complete_lines(data: bytes) -> int:
+    """Länge des Anteils, der mit einem Zeilenumbruch endet."""
+    return data.rfind(b"\n") + 1
+
+
+def _read_delta(raw_path, mark, clean_path):
+    """
+    Gibt die seit dem Wasserstand angehängten Bytes zurück oder None, wenn
+    die Rohdatei (oder die Clean-Datei) nicht mehr zum Vermerk passt.
+    """
+    if not mark or "lines" not in mark or not os.path.exists(clean_path):
+        return None
+    if os.path.getsize(clean_path) != mark["clean_size"]:
+        return None
+    offset = mark["offset"]
+    tail = mark["tail"].encode("utf-8")
+    if os.path.getsize(raw_path) < offset:
+        return None
+    with open(raw_path, "rb") as f:
+        header = f.readline()
+        f.seek(offset - len(tail))
+        if header != mark["header"].encode("utf-8") or f.read(len(tail)) != tail:
+            return None
+        rest = f.read()
+    return rest[:_complete_lines(rest)]
+
+
+def _mark(offset, tail, header, lines, clean_path, parquet):
+    return {
+        "offset": offset,
+        "tail": tail.decode("utf-8"),
+        "header": header.decode("utf-8"),
+        "lines": lines,
+        "clean_size": os.path.getsize(clean_path),
+        "parquet": parquet,
+    }
 
 
 def copy_and_validate_csvs(
-    paths: dict, log=None, show_log=None, log_container=None
+    paths: dict, log=None, show_log=None, log_container=None, rebuild=None
 ):
+    """
+    rebuild — Rohdateinamen, die komplett neu aufbereitet werden sollen
+              (z. B. weil SQLite vorhandene Zeilen geändert hat); True = alle
+
+    Gibt die Abweisungen dieses Laufs zurück (Liste von Dicts, siehe
+    REJECTION_FIELDS).
+    """
     output_folder = paths["output_folder"]
     clean_folder = paths["clean_folder"]
     file_names = paths["file_names"]
     final_names = paths["final_names"]
     expected_columns = paths["expected_columns"]
+    parquet_folder = paths.get("parquet_folder")
+    watermark_path = paths.get("watermark_path")
+    if parquet_folder and not parquet_available():
+        if log:
+            log("⚠️ pyarrow nicht installiert – Parquet-Ausgabe übersprungen.", "warning")
+        parquet_folder = None
 
+    run_started = datetime.now().isoformat(timespec="seconds")
+    watermarks = load_watermarks(watermark_path)
     cleaned_files = []
+    parquet_tables = []
+    rejections = []
+    appended_rows = 0
+    rebuilt_files = []
 
     for raw_fname in file_names:
         raw_path = os.path.join(output_folder, raw_fname)
         final_name = final_names.get(raw_fname, raw_fname)
         clean_path = os.path.join(clean_folder, final_name)
+        table_name = os.path.splitext(final_name)[0]
 
         if not os.path.exists(raw_path):
             continue
@@ -89,37 +282,119 @@ def copy_and_validate_csvs(
         os.makedirs(clean_folder, exist_ok=True)
 
         try:
-            with open(raw_path, "r", encoding="utf-8") as infile:
-                raw_lines = infile.readlines()
-
-            if not raw_lines:
+            if os.path.getsize(raw_path) == 0:
                 continue  # Leere Datei überspringen
 
+            mark = watermarks.get(raw_fname)
+            full = rebuild is True or raw_fname in (rebuild or ())
+            if parquet_folder and table_name in CLEAN_SCHEMAS:
+                # Parquet fehlt oder wurde beim letzten Mal nicht mitgeschrieben
+                full = full or not (mark or {}).get("parquet") \
+                    or not os.path.isdir(os.path.join(parquet_folder, table_name))
+            delta = None if full else _read_delta(raw_path, mark, clean_path)
+
+            if delta is None:
+                # Komplett: ganze Rohdatei bis zur letzten vollständigen Zeile
+                with open(raw_path, "rb") as infile:
+                    data = infile.read()
+                data = data[:_complete_lines(data)]
+                if not data:
+                    continue
+                header_bytes = data[:data.find(b"\n") + 1]
+                header, lines_before = None, 0
+            else:
+                if not delta:
+                    cleaned_files.append(clean_path)
+                    continue  # Nichts Neues
+                data = delta
+                header_bytes = mark["header"].encode("utf-8")
+                header = next(csv.reader([header_bytes.decode("utf-8-sig")], delimiter=";"))
+                lines_before = mark["lines"]
+
+            # Einmal lesen: Spaltenzahl prüfen und Zeilen übernehmen
+            expected = expected_columns.get(raw_fname)
+            if expected is None:
+                expected = len(next(csv.reader([header_bytes.decode("utf-8-sig")], delimiter=";")))
+            header, rows, line_nos, file_rejections = read_validated_rows(
+                data.decode("utf-8-sig"), raw_fname, expected, header=header, first_line_no=lines_before
+            )
+            if file_rejections and file_rejections[0]["grund"] == "kopfzeile":
+                rejections.extend(file_rejections)
+                watermarks.pop(raw_fname, None)
+                continue
+
             # Header-Zeile formatieren
-            header = raw_lines[0].strip().split(";")
             header_snake = [to_snake_case(col) for col in header]
-            clean_lines = [";".join(header_snake) + "\n"] + raw_lines[1:]
+            frame = pd.DataFrame(rows, columns=header_snake, dtype=object)
 
-            with open(clean_path, "w", encoding="utf-8") as outfile:
-                outfile.writelines(clean_lines)
+            # Anzeigewerte einmalig in Zahlen/Datum/Sekunden umwandeln
+            if table_name in CLEAN_SCHEMAS:
+                typed = normalise_frame(frame, table_name)
+                typed, type_rejections = reject_type_errors(frame, typed, table_name, raw_fname, line_nos)
+                file_rejections += type_rejections
+                frame = typed
+            rejections.extend(file_rejections)
+            text = clean_csv_text(frame, header=delta is None)
 
-            # Optional: CSV-Validierung
-            problems = validate_csv(
-                clean_path, expected_columns.get(raw_fname, len(header_snake))
-            )
-            if problems:
-                pass
+            with open(clean_path, "w" if delta is None else "a", encoding="utf-8", newline="") as outfile:
+                outfile.write(text)
+
+            parquet_failed = False
+            if parquet_folder and len(frame):
+                write = write_parquet_dataset if delta is None else append_parquet_dataset
+                try:
+                    if write(frame, table_name, parquet_folder):
+                        parquet_tables.append(final_name)
+                except Exception as e:
+                    parquet_failed = True
+                    if log:
+                        log(f"⚠️ Parquet für {final_name} fehlgeschlagen: {e}", "warning")
+
+            if parquet_failed:
+                # Ohne Vermerk wird die Datei beim nächsten Lauf komplett aufbereitet
+                watermarks.pop(raw_fname, None)
             else:
-                cleaned_files.append(clean_path)
+                tail = data[data.rfind(b"\n", 0, len(data) - 1) + 1:]
+                lines = lines_before + data.count(b"\n")
+                watermarks[raw_fname] = _mark(
+                    offset=(0 if delta is None else mark["offset"]) + len(data),
+                    tail=tail, header=header_bytes, lines=lines, clean_path=clean_path,
+                    parquet=bool(parquet_folder),
+                )
+            if delta is None:
+                rebuilt_files.append(final_name)
+            else:
+                appended_rows += len(frame)
+            cleaned_files.append(clean_path)
 
         except Exception as e:
-            pass
+            watermarks.pop(raw_fname, None)
+            rejections.append(_rejection(raw_fname, "", "fehler", value=f"{type(e).__name__}: {e}"))
+
+    if watermark_path:
+        save_watermarks(watermark_path, watermarks)
+    write_rejections(paths.get("rejection_path"), rejections, run_started)
 
     # Abschließende Log-Meldung
-    if not cleaned_files:
-        pass
-    else:
+    if cleaned_files and log:
         log("✅ Alle Daten wurden in den clean-Ordner geschrieben.", "success")
+    if log and (appended_rows or rebuilt_files):
+        log(
+            f"🧮 Aufbereitung: {appended_rows} neue Zeilen angehängt, "
+            f"{len(rebuilt_files)} Dateien komplett neu aufbereitet.",
+            "info",
+        )
+    if parquet_tables and log:
+        log(f"✅ {len(parquet_tables)} Tabellen als Parquet (monatsweise) geschrieben.", "success")
+    if rejections and log:
+        per_file = Counter(rejection["datei"] for rejection in rejections)
+        details = ", ".join(f"{name}: {count}" for name, count in per_file.items())
+        log(
+            f"⚠️ {len(rejections)} Rohzeilen/Werte abgewiesen ({details}) – "
+            f"siehe {os.path.basename(paths.get('rejection_path') or 'clean_rejections.csv')}.",
+            "warning",
+        )
 
     if log_container:
         show_log(log_container)
+    return rejections
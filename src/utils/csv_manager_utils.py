@@ -1,21 +1,63 @@
+import codecs
 import csv
+import io
 import os
-from typing import List, Dict, Union
+import threading
+from typing import Iterable, List, Dict, Optional, Union, Set, Tuple
+
+from src.utils.timing_utils import span
+
+
+# Prozessweiter Schlüssel-Index pro Datei: wird einmal geladen und bei jedem
+# append_row fortgeschrieben, statt die CSV für jede Zeile neu zu parsen.
+# Neben dem Index steht (Größe, mtime) der Datei; ändert sich die Datei von
+# außen (Bereinigung, Editor, zweiter Prozess), wird der Index neu gelesen.
+_ROW_INDEX: Dict[str, Tuple[Optional[Tuple[int, int]], Set[Tuple[str, ...]]]] = {}
+
+# Ein Lock pro Datei, damit parallele Scraper-Threads sauber anhängen.
+_FILE_LOCKS: Dict[str, threading.RLock] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+
+
+def _file_lock(key: str) -> threading.RLock:
+    with _FILE_LOCKS_GUARD:
+        return _FILE_LOCKS.setdefault(key, threading.RLock())
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
 
 
 class CSVFileHandler:
     def __init__(self,
                  file_path: str,
                  headers: List[str] = None,
-                 delimiter: str = ';'):
+                 delimiter: str = ';',
+                 store=None):
         """
         file_path  — where to write
         headers    — optional list of column names (writes header if file empty)
         delimiter  — character to separate fields on write (default ';')
+        store      — optional SQLiteStore: rows go into the table named after
+                     the file, the CSV is generated via export()
         """
         self.file_path = file_path
         self.headers   = headers
         self.delimiter = delimiter
+        self.store     = store
+        self.table     = os.path.splitext(os.path.basename(file_path))[0]
+        self._pending = None
+        self._pending_keys = None
+
+        if store is not None:
+            if not headers:
+                raise ValueError("Für die SQLite-Ablage werden headers benötigt.")
+            store.ensure_table(self.table, headers, csv_path=file_path, delimiter=delimiter)
+            return
 
         # Only write headers if file is missing or zero‐length
         file_missing = not os.path.exists(file_path)
@@ -24,30 +66,79 @@ class CSVFileHandler:
             with open(file_path, mode='w', newline='', encoding='utf-8-sig') as f:
                 writer = csv.writer(f, delimiter=self.delimiter)
                 writer.writerow(self.headers)
+            _ROW_INDEX.pop(self._index_key(), None)
+
+    def _index_key(self) -> str:
+        return os.path.normcase(os.path.abspath(self.file_path))
+
+    def _row_key(self, row: Union[List, Dict]) -> Tuple[str, ...]:
+        """
+        Normalised, hashable key of a row — dicts are ordered by self.headers.
+        """
+        if isinstance(row, dict):
+            row = [row.get(h) for h in self.headers]
+        return tuple('' if value is None else str(value) for value in row)
+
+    def _cached_index(self) -> Optional[Set[Tuple[str, ...]]]:
+        """
+        Return the cached key index, or None if it is missing or the file
+        changed on disk (size or mtime) since it was loaded.
+        """
+        cached = _ROW_INDEX.get(self._index_key())
+        if cached is None or cached[0] != _file_stamp(self.file_path):
+            return None
+        return cached[1]
+
+    def _load_index(self) -> Set[Tuple[str, ...]]:
+        """
+        Return the key index of the file, reading it again only when the
+        file changed since the last load.
+        """
+        key = self._index_key()
+        with _file_lock(key):
+            index = self._cached_index()
+            if index is not None:
+                return index
+
+            index = set()
+            stamp = _file_stamp(self.file_path)
+            if stamp is not None:
+                with span("csv_index_load", file=os.path.basename(self.file_path)), \
+                        open(self.file_path, newline='', encoding='utf-8-sig') as f:
+                    reader = csv.reader(f, delimiter=self.delimiter)
+                    if self.headers:
+                        next(reader, None)  # Header-Zeile überspringen
+                    for existing_row in reader:
+                        if existing_row:
+                            index.add(tuple(existing_row))
+            _ROW_INDEX[key] = (stamp, index)
+            return index
 
     def row_exists(self, row: Union[List, Dict]) -> bool:
         """
         Check if a given row already exists in the file.
-        Prevents duplicate entries.
+        Prevents duplicate entries (O(1) lookup in the cached key index).
+        With a store, rows with the same natural key count as existing.
         """
-        if not os.path.exists(self.file_path):
-            return False
+        if self.store is not None:
+            return self.store.row_exists(self.table, row)
+        return self._row_key(row) in self._load_index()
 
-        with open(self.file_path, newline='', encoding='utf-8-sig') as f:
-            if self.headers:
-                # If headers exist, read as dictionary
-                reader = csv.DictReader(f)
-                for existing_row in reader:
-                    if isinstance(row, dict):
-                        # Compare values by header keys
-                        if all(str(row[h]) == existing_row.get(h, '') for h in self.headers):
-                            return True
-            else:
-                # No headers: compare as lists
-                reader = csv.reader(f)
-                for existing_row in reader:
-                    if row == existing_row:
-                        return True
+    def __enter__(self):
+        """
+        Buffer every append_row inside the with-block and flush the rows in
+        one write when the block ends.
+        """
+        self._pending = []
+        self._pending_keys = set()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pending = self._pending
+        self._pending = None
+        self._pending_keys = None
+        if pending:
+            self.append_rows(pending, check_duplicate=False)
         return False
 
     def append_row(self, row: Union[List, Dict], check_duplicate: bool = True):
@@ -56,33 +147,98 @@ class CSVFileHandler:
         - Ensures the file ends with a newline before appending.
         - Optionally skips if row already exists.
         - Writes fields using self.delimiter (semicolon).
+        - Inside a with-block the row is only buffered until the block ends.
         """
-        # 1) Skip duplicate if asked
-        if check_duplicate and self.row_exists(row):
+        if self._pending is None:
+            if self.store is not None:
+                # Einzelne Zeile: anhängen statt den ganzen Tag zu ersetzen
+                if not (check_duplicate and self.row_exists(row)):
+                    self.store.insert_rows(self.table, [row])
+                return
+            self.append_rows([row], check_duplicate=check_duplicate)
+            return
+
+        if self.store is not None:
+            # Beim Flush ersetzen die gesammelten Zeilen ihre Tage als Ganzes
+            self._pending.append(row)
             return
 
-        # 2) Ensure the file ends with a newline
-        if os.path.exists(self.file_path):
-            try:
-                with open(self.file_path, mode='rb+') as f:
-                    f.seek(-1, os.SEEK_END)
-                    last_char = f.read(1)
-                    if last_char not in (b'\n', b'\r'):
-                        f.write(b'\n')
-            except OSError:
-                pass
-
-        # 3) Append the row
-        with open(self.file_path, mode='a', newline='', encoding='utf-8-sig') as f:
-            if isinstance(row, dict):
-                if not self.headers:
-                    raise ValueError("Ohne header kannst du keine Dictionary nutzen.")
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=self.headers,
-                    delimiter=self.delimiter
-                )
+        key = self._row_key(row)
+        if check_duplicate and (key in self._pending_keys or self.row_exists(row)):
+            return
+        self._pending_keys.add(key)
+        self._pending.append(row)
+
+    def append_rows(self, rows: Iterable[Union[List, Dict]], check_duplicate: bool = True) -> int:
+        """
+        Append many rows with a single file handle and one buffered write.
+        - Duplicates (in the file or within rows) are skipped if asked.
+        - Returns the number of rows actually written.
+        - Thread-safe: concurrent writers to the same file are serialised.
+        - With a store, the rows are a complete scrape of the days they
+          contain: each day is replaced as a whole (changed days are counted)
+          and the CSV is left alone until export().
+        """
+        rows = list(rows)
+        if self.store is not None:
+            return self.store.replace_days(self.table, rows)
+        with span("csv_write", file=os.path.basename(self.file_path)), _file_lock(self._index_key()):
+            index = self._load_index() if check_duplicate else self._cached_index()
+            buffer = io.StringIO()
+            if self.headers:
+                dict_writer = csv.DictWriter(buffer, fieldnames=self.headers, delimiter=self.delimiter)
+            list_writer = csv.writer(buffer, delimiter=self.delimiter)
+
+            new_keys = set()
+            for row in rows:
+                key = self._row_key(row)
+                if check_duplicate and (key in index or key in new_keys):
+                    continue
+                if isinstance(row, dict):
+                    if not self.headers:
+                        raise ValueError("Ohne header kannst du keine Dictionary nutzen.")
+                    dict_writer.writerow(row)
+                else:
+                    list_writer.writerow(row)
+                new_keys.add(key)
+
+            if not new_keys:
+                return 0
+
+            self._write_block(buffer.getvalue())
+
+            # Keep the index in sync (only if it was already loaded) and
+            # remember the new file state, so our own write is no reload
+            if index is not None:
+                index.update(new_keys)
+                _ROW_INDEX[self._index_key()] = (_file_stamp(self.file_path), index)
+            return len(new_keys)
+
+    def _write_block(self, text: str):
+        """
+        Append already formatted CSV text through one file handle.
+        Ensures the file ends with a newline before appending and writes the
+        UTF-8 BOM if the file is still empty.
+        """
+        with open(self.file_path, mode='ab+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                f.write(codecs.BOM_UTF8)
             else:
-                writer = csv.writer(f, delimiter=self.delimiter)
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) not in (b'\n', b'\r'):
+                    f.write(b'\n')
+            f.write(text.encode('utf-8'))
 
-            writer.writerow(row)
+    def export(self) -> int:
+        """
+        Bring the CSV up to date with the store (no-op without a store):
+        new rows are appended, replaced days rewrite the file, and rows
+        added to the CSV by hand are taken over first.
+        Returns the number of data rows written.
+        """
+        if self.store is None:
+            return 0
+        count = self.store.export_csv(self.table, self.file_path, delimiter=self.delimiter)
+        _ROW_INDEX.pop(self._index_key(), None)
+        return count
@@ -0,0 +1,177 @@
+import atexit
+import threading
+import time
+from src.utils.calender_utils import forget_displayed_months
+from src.utils.chrome_utils import URL, init_driver_with_cookies, quit_driver, session_valid, sync_worker_profiles
+from src.utils.timing_utils import span
+
+
+# ========== Warme Browser zwischen den Läufen ==========
+#
+# Streamlit führt das Skript bei jedem Klick neu aus, die importierten Module
+# bleiben aber im Prozess. Der Pool hält angemeldete Browser nach einem Lauf
+# offen und gibt sie beim nächsten Lauf nach einer kurzen Prüfung wieder aus –
+# ein kurzer Lauf (z. B. nur gestern) spart so Chrome-Start und Berichtsaufbau.
+
+# Browser, die länger unbenutzt waren, werden beendet (Sitzung/Speicher und
+# damit die Profilsperre – sonst startet z. B. der CLI-Lauf kein Chrome)
+MAX_IDLE_SECONDS = 10 * 60
+
+# Abstand, in dem ein Hintergrund-Timer abgelaufene Browser beendet
+REAP_INTERVAL_SECONDS = 60
+
+
+class DriverPool:
+    def __init__(self, max_idle: float = MAX_IDLE_SECONDS):
+        """
+        max_idle — Sekunden, nach denen ein ungenutzter Browser verworfen wird
+        """
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = {}  # (slot, capture_network, headless) -> (driver, seit)
+        self._keys = {}  # id(driver) -> Schlüssel der ausgegebenen Browser
+        self._reaper = None
+
+    def _healthy(self, driver) -> bool:
+        """Browser reagiert, ist angemeldet und zeigt noch den Bericht."""
+        try:
+            if not driver.window_handles:
+                return False
+            if not session_valid(driver):
+                return False
+            if URL.split("/page/")[0] not in driver.current_url:
+                driver.get(URL)
+                # Neu geladene Seite: Kalender zeigt wieder den Standardmonat
+                forget_displayed_months(driver)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver) -> None:
+        try:
+            quit_driver(driver)
+        except Exception as e:
+            print(f"⚠️ Browser ließ sich nicht beenden: {e}")
+
+    def acquire(self, slot: int = 0, capture_network: bool = False, headless: bool = True):
+        """
+        Gibt einen angemeldeten Browser für `slot` zurück – aus dem Pool, wenn
+        ein gesunder mit denselben Startoptionen wartet, sonst neu gestartet.
+        Wartende Browser desselben Slots mit anderen Optionen werden vorher
+        beendet: sie halten dasselbe Chrome-Profil offen.
+        """
+        key = (slot, capture_network, headless)
+        with self._lock:
+            idle = self._idle.pop(key, None)
+            others = [self._idle.pop(k)[0] for k in list(self._idle) if k[0] == slot]
+        for driver in others:
+            print(f"🔁 Browser {slot + 1} mit anderen Startoptionen im Pool – wird beendet.")
+            self._discard(driver)
+        if idle is not None:
+            driver, since = idle
+            with span("pool_check", slot=slot):
+                fresh = time.monotonic() - since < self.max_idle
+                reusable = fresh and self._healthy(driver)
+            if reusable:
+                print(f"♻️ Browser {slot + 1} aus dem Pool wiederverwendet.")
+            else:
+                print(f"🔁 Browser {slot + 1} im Pool nicht mehr nutzbar – Neustart.")
+                self._discard(driver)
+                driver = None
+        else:
+            driver = None
+        if driver is None:
+            driver = init_driver_with_cookies(capture_network=capture_network, slot=slot, headless=headless)
+        with self._lock:
+            self._keys[id(driver)] = key
+        return driver
+
+    def release(self, driver) -> None:
+        """
+        Legt einen Browser nach dem Lauf zurück in den Pool. Wartet dort schon
+        einer mit demselben Schlüssel, wird der ältere beendet.
+        """
+        with self._lock:
+            key = self._keys.pop(id(driver), None)
+            previous = []
+            if key is not None:
+                previous = [self._idle.pop(k)[0] for k in list(self._idle) if k[0] == key[0]]
+                self._idle[key] = (driver, time.monotonic())
+                self._schedule_reaper()
+        if key is None:
+            self._discard(driver)
+        for stale in previous:
+            self._discard(stale)
+
+    def _schedule_reaper(self) -> None:
+        # Aufruf nur mit gehaltenem self._lock
+        if self._reaper is None:
+            self._reaper = threading.Timer(REAP_INTERVAL_SECONDS, self._reap_and_reschedule)
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _reap_and_reschedule(self) -> None:
+        self.reap()
+        with self._lock:
+            self._reaper = None
+            if self._idle:
+                self._schedule_reaper()
+
+    def reap(self) -> int:
+        """
+        Beendet wartende Browser, die länger als max_idle unbenutzt sind, und
+        gibt so ihr Profil frei. Gibt die Anzahl beendeter Browser zurück.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, since) in self._idle.items() if now - since >= self.max_idle]
+            drivers = [self._idle.pop(key)[0] for key in expired]
+        for driver in drivers:
+            self._discard(driver)
+        if drivers:
+            print(f"💤 {len(drivers)} ungenutzte Browser beendet – Profil wieder frei.")
+        return len(drivers)
+
+    def idle_slots(self) -> set:
+        """Slots, für die gerade ein Browser im Pool wartet."""
+        with self._lock:
+            return {key[0] for key in self._idle}
+
+    def prepare_profiles(self, count: int) -> None:
+        """
+        Kopiert das Chrome-Profil für die parallelen Browser – außer für Slots,
+        deren Browser im Pool das Profil noch geöffnet haben. Ein wartender
+        Browser auf dem Hauptprofil (Slot 0) wird vorher beendet, damit
+        nicht mitten in seine Schreibvorgänge hinein kopiert wird.
+        """
+        with self._lock:
+            main = [key for key in self._idle if key[0] == 0]
+            drivers = [self._idle.pop(key)[0] for key in main]
+        for driver in drivers:
+            self._discard(driver)
+        sync_worker_profiles(count, skip=self.idle_slots())
+
+    def shutdown(self) -> None:
+        """Beendet alle wartenden Browser (z. B. vor einer neuen Anmeldung)."""
+        with self._lock:
+            drivers = [driver for driver, _ in self._idle.values()]
+            self._idle.clear()
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+        for driver in drivers:
+            self._discard(driver)
+
+
+_POOL = None
+_POOL_GUARD = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Der prozessweite Pool (wird beim ersten Aufruf angelegt)."""
+    global _POOL
+    with _POOL_GUARD:
+        if _POOL is None:
+            _POOL = DriverPool()
+            atexit.register(_POOL.shutdown)
+        return _POOL
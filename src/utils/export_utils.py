@@ -0,0 +1,200 @@
+import csv
+import os
+import re
+import shutil
+import tempfile
+import time
+import weakref
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from src.utils.network_capture_utils import WIDGET_COLUMNS, build_widget_rows
+from src.utils.table_engine_utils import TABLE_SPECS
+from src.utils.timing_utils import span
+
+
+# ========== Tabellen über "Daten exportieren" laden ==========
+#
+# Statt eine Tabelle Seite für Seite über ".pageForward" zu lesen, lässt sich
+# jedes Diagramm über sein Kontextmenü als CSV exportieren. Chrome legt die
+# Datei in einem temporären Ordner ab; daraus bauen wir dieselben Zeilen wie
+# der DOM-Scraper – ein Download pro Tabelle und Tag statt vieler Seitenwechsel.
+
+# Tabellen-Index (wie in read_table_page) der exportierbaren Widgets
+EXPORT_TABLES = {widget: spec.table_index for widget, spec in TABLE_SPECS.items()}
+
+# Spalten, die im Export als Rohzahl kommen und wie im Dashboard formatiert werden
+NUMERIC_COLUMNS = {"aufrufe", "aktive nutzer", "ereignisanzahl", "sitzungen", "aufrufe pro sitzung"}
+# Davon reine Zählwerte: ein Punkt/Komma darin kann nur Tausendertrenner sein
+INTEGER_COLUMNS = NUMERIC_COLUMNS - {"aufrufe pro sitzung"}
+
+# Zahl mit Tausendertrenner ohne Nachkommastellen ("1.234", "12,345,678")
+_GROUPED = {sep: re.compile(r"^\d{1,3}(?:" + re.escape(sep) + r"\d{3})+$") for sep in ".,"}
+
+# Beschriftungen im Menü/Dialog (deutsche und englische Oberfläche)
+EXPORT_MENU_LABELS = ["Exportieren", "Daten exportieren", "Export", "Export data"]
+CSV_FORMAT_LABELS = ["CSV"]
+CONFIRM_LABELS = ["Exportieren", "Export"]
+
+_CLICK_TEXT_JS = """
+const selector = arguments[0];
+const labels = arguments[1].map(l => l.toLowerCase());
+for (const el of document.querySelectorAll(selector)) {
+    const text = (el.innerText || el.getAttribute('aria-label') || '').trim().toLowerCase();
+    if (labels.includes(text) && el.offsetParent !== null) {
+        el.click();
+        return true;
+    }
+}
+return false;
+"""
+
+MENU_ITEM_SELECTOR = "[role='menuitem'], .mat-menu-item, .mat-mdc-menu-item"
+RADIO_SELECTOR = "mat-radio-button, [role='radio'], label"
+DIALOG_BUTTON_SELECTOR = "mat-dialog-container button, [role='dialog'] button"
+
+_DOWNLOAD_DIRS = weakref.WeakKeyDictionary()
+
+
+def download_dir(driver) -> str:
+    """
+    Gibt den temporären Download-Ordner des Browsers zurück und leitet die
+    Chrome-Downloads beim ersten Aufruf dorthin um.
+    """
+    folder = _DOWNLOAD_DIRS.get(driver)
+    if folder is None:
+        folder = tempfile.mkdtemp(prefix="looker_export_")
+        driver.execute_cdp_cmd(
+            "Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": folder}
+        )
+        _DOWNLOAD_DIRS[driver] = folder
+    return folder
+
+
+def remove_download_dir(driver) -> None:
+    """Löscht den temporären Download-Ordner des Browsers (falls angelegt)."""
+    folder = _DOWNLOAD_DIRS.pop(driver, None)
+    if folder:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def _click_text(driver, selector: str, labels: list, timeout: float) -> None:
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script(_CLICK_TEXT_JS, selector, labels)
+    )
+
+
+def wait_for_download(folder: str, known: set, timeout: float = 30, poll: float = 0.25) -> str:
+    """
+    Wartet, bis im Ordner eine neue, fertig geschriebene CSV-Datei liegt,
+    und gibt ihren Pfad zurück.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        names = set(os.listdir(folder)) - known
+        if names and not any(name.endswith(".crdownload") for name in names):
+            done = [name for name in names if name.lower().endswith(".csv")]
+            if done:
+                return os.path.join(folder, done[0])
+        time.sleep(poll)
+    raise TimeoutError(f"⏱️ Kein Download in {folder} nach {timeout} s.")
+
+
+def export_table_csv(driver, table_index: int, timeout: float = 30) -> str:
+    """
+    Exportiert die Tabelle `table_index` über das Kontextmenü als CSV und
+    gibt den Pfad der heruntergeladenen Datei zurück.
+    """
+    folder = download_dir(driver)
+    known = set(os.listdir(folder))
+
+    tables = driver.find_elements(By.CSS_SELECTOR, ".table")
+    if len(tables) <= table_index:
+        raise Exception(f"❌ Erwartete Tabelle (Index {table_index}) nicht gefunden.")
+
+    with span("export_menu"):
+        ActionChains(driver).context_click(tables[table_index]).perform()
+        _click_text(driver, MENU_ITEM_SELECTOR, EXPORT_MENU_LABELS, timeout=5)
+        # In manchen Berichten öffnet "Exportieren" erst ein Untermenü
+        driver.execute_script(_CLICK_TEXT_JS, MENU_ITEM_SELECTOR, ["Daten exportieren", "Export data"])
+        _click_text(driver, RADIO_SELECTOR, CSV_FORMAT_LABELS, timeout=5)
+        _click_text(driver, DIALOG_BUTTON_SELECTOR, CONFIRM_LABELS, timeout=5)
+
+    with span("export_download"):
+        return wait_for_download(folder, known, timeout=timeout)
+
+
+def detect_decimal_separator(samples: list) -> str:
+    """
+    Bestimmt einmal pro Exportdatei das Dezimalzeichen aus den Werten der
+    Zahlenspalten (`samples`: Paare aus Spaltenname und Text). Der Export
+    kommt je nach Einstellung roh ("1234", "4.5"), deutsch ("1.234", "4,5")
+    oder englisch formatiert ("1,234", "4.5"); ein einzelner Wert wie
+    "1.234" ist für sich allein nicht eindeutig.
+    """
+    values = [(name, text.strip()) for name, text in samples if text.strip()]
+    for _, text in values:
+        if "." in text and "," in text:
+            return "," if text.rfind(",") > text.rfind(".") else "."
+    commas = [text for _, text in values if "," in text]
+    if commas:
+        return "," if any(not _GROUPED[","].match(text) for text in commas) else "."
+    if any(name in INTEGER_COLUMNS and _GROUPED["."].match(text) for name, text in values):
+        return ","
+    return "."
+
+
+def _to_number(text: str, decimal: str = "."):
+    text = text.strip()
+    if not text:
+        return text
+    grouping = "." if decimal == "," else ","
+    try:
+        return float(text.replace(grouping, "").replace(decimal, "."))
+    except ValueError:
+        return text
+
+
+def parse_export_csv(path: str, widget: str, date_str: str) -> list:
+    """
+    Liest eine exportierte CSV-Datei (Kopfzeile + Werte in Spaltenreihenfolge
+    der Tabelle) und baut daraus die Zeilen der Rohdatei. Das Zahlenformat
+    wird einmal für die ganze Datei bestimmt (detect_decimal_separator).
+    """
+    columns = WIDGET_COLUMNS[widget]
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        next(reader, None)
+        lines = [values for values in reader if any(value.strip() for value in values)]
+
+    decimal = detect_decimal_separator([
+        (name, value) for values in lines for name, value in zip(columns, values) if name in NUMERIC_COLUMNS
+    ])
+    records = [
+        [
+            _to_number(value, decimal) if name in NUMERIC_COLUMNS else value.strip()
+            for name, value in zip(columns, values)
+        ]
+        for values in lines
+    ]
+    return build_widget_rows(widget, records, date_str)
+
+
+def export_rows(driver, widget: str, date_str: str, timeout: float = 30) -> list:
+    """
+    Exportiert die Tabelle eines Widgets und gibt die Zeilen-Dicts zurück.
+    Die heruntergeladene Datei wird danach gelöscht.
+    """
+    path = export_table_csv(driver, EXPORT_TABLES[widget], timeout=timeout)
+    try:
+        data = parse_export_csv(path, widget, date_str)
+    finally:
+        os.remove(path)
+    print(f"✅ {len(data)} Datensätze für {widget} aus dem CSV-Export.")
+    return data
@@ -1,6 +1,5 @@
 import sys
 import os
-import streamlit as st
 
 
 def resource_path(relative_path: str) -> str:
@@ -16,6 +15,7 @@ def resource_path(relative_path: str) -> str:
 
 
 def load_custom_css(relative_css_path: str):
+    import streamlit as st
     css_file = resource_path(relative_css_path)
     if not os.path.isfile(css_file):
         st.error(f"CSS nicht gefunden: {css_file}")
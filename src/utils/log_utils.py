@@ -1,12 +1,31 @@
 import os
 import csv
-import streamlit as st
-from datetime import datetime
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from src.utils.csv_manager_utils import _file_stamp
 
 SCRAPE_LOG_PATH = os.path.join("src", "data", "log", "scrape_log.csv")
+_SCRAPE_LOG_LOCK = threading.Lock()
+# ((Größe, mtime) der Datei, Set der ISO-Daten) – neu gelesen, sobald ein
+# anderer Prozess (CLI-Lauf neben der App) die Datei geändert hat
+_SCRAPED_DATES = None
+
+# Ohne Streamlit (Kommandozeile, cron) gehen die Meldungen nach stderr.
+# Streamlit wird erst beim ersten Log-Aufruf in der App importiert.
+_CONSOLE_LOG = False
+
+def use_console_log() -> None:
+    """Leitet log() auf stderr um (für den Betrieb ohne Streamlit)."""
+    global _CONSOLE_LOG
+    _CONSOLE_LOG = True
 
-if "log_messages" not in st.session_state:
-    st.session_state.log_messages = []
+def _session_messages() -> list:
+    import streamlit as st
+    if "log_messages" not in st.session_state:
+        st.session_state.log_messages = []
+    return st.session_state.log_messages
 
 def log(message: str, level: str = "info") -> None:
     colors = {
@@ -16,36 +35,67 @@ def log(message: str, level: str = "info") -> None:
         "success": "#6fff00",
     }
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if _CONSOLE_LOG:
+        print(f"[{timestamp}] {level.upper():<7} {message.strip()}", file=sys.stderr, flush=True)
+        return
     color = colors.get(level, "#ffffff")
     styled_message = f'<div style="color: {color}; font-family: monospace;">[{timestamp}] {message}</div>'
-    st.session_state.log_messages.append(styled_message)
+    _session_messages().append(styled_message)
 
 def show_log(container):
+    if _CONSOLE_LOG or container is None:
+        return
     container.markdown(
         f"""
         <div id="log-container">
-        {"".join(st.session_state.log_messages)}
+        {"".join(_session_messages())}
         </div>
         """,
         unsafe_allow_html=True,
     )
 
-def is_date_scraped(scrape_date) -> bool:
-    if not os.path.exists(SCRAPE_LOG_PATH):
-        return False
-    with open(SCRAPE_LOG_PATH, newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        next(reader, None)
-        for row in reader:
-            if row and row[0] == scrape_date.isoformat():
-                return True
-    return False
+def _scraped_dates_locked() -> set:
+    global _SCRAPED_DATES
+    stamp = _file_stamp(SCRAPE_LOG_PATH)
+    if _SCRAPED_DATES is None or _SCRAPED_DATES[0] != stamp:
+        dates = set()
+        if stamp is not None:
+            with open(SCRAPE_LOG_PATH, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                dates = {row[0] for row in reader if row}
+        _SCRAPED_DATES = (stamp, dates)
+    return _SCRAPED_DATES[1]
+
+def load_scraped_dates() -> set:
+    """
+    Liest scrape_log.csv in ein Set von ISO-Daten ein – erneut nur, wenn
+    sich die Datei seit dem letzten Lesen geändert hat (Größe, mtime).
+    """
+    with _SCRAPE_LOG_LOCK:
+        return _scraped_dates_locked()
+
+def missing_dates(start_date, end_date) -> list:
+    """
+    Alle Tage im Zeitraum, die noch nicht im Scrape-Log stehen (sortiert),
+    berechnet über eine einzige Mengendifferenz.
+    """
+    total_days = (end_date - start_date).days + 1
+    requested = {start_date + timedelta(days=i) for i in range(max(total_days, 0))}
+    scraped = load_scraped_dates()
+    return sorted(d for d in requested if d.isoformat() not in scraped)
 
 def log_scraped_date(scrape_date) -> None:
+    global _SCRAPED_DATES
     os.makedirs(os.path.dirname(SCRAPE_LOG_PATH), exist_ok=True)
-    file_exists = os.path.exists(SCRAPE_LOG_PATH)
-    with open(SCRAPE_LOG_PATH, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["Datum"])
-        writer.writerow([scrape_date.isoformat()])
+    with _SCRAPE_LOG_LOCK:
+        scraped = _scraped_dates_locked()
+        file_exists = os.path.exists(SCRAPE_LOG_PATH)
+        with open(SCRAPE_LOG_PATH, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if not file_exists:
+                writer.writerow(["Datum"])
+            writer.writerow([scrape_date.isoformat()])
+        scraped.add(scrape_date.isoformat())
+        # Eigener Eintrag: kein Neulesen beim nächsten Aufruf
+        _SCRAPED_DATES = (_file_stamp(SCRAPE_LOG_PATH), scraped)
@@ -0,0 +1,359 @@
+import json
+import time
+from datetime import date
+from src.utils.table_engine_utils import TABLE_SPECS
+
+
+# ========== Netzwerk-Mitschnitt der Looker-Datenabfragen ==========
+#
+# Looker Studio lädt die Werte jedes Diagramms über POST-Anfragen an
+# ".../batchedDataV2". Mit aktiviertem Performance-Log (goog:loggingPrefs)
+# lesen wir diese Antworten direkt über das Chrome DevTools Protocol aus und
+# sparen uns das Zellen-für-Zellen-Lesen samt Blättern durch die Tabellen.
+
+DATA_ENDPOINT = "batchedDataV2"
+XSSI_PREFIX = ")]}'"
+
+# Komponenten-IDs ("cd-…") der Widgets im Bericht. Die IDs ermittelt
+#   python -m src.utils.cli_utils --discover-components
+# (Mitschnitt eines Tages, Abgleich mit den DOM-Tabellen, Vorschlag für diese
+# Tabelle) und werden hier einmalig eingetragen. Ist eine ID nicht gesetzt,
+# wird für das Widget der DOM-Scraper verwendet.
+WIDGET_COMPONENTS = {
+    "landingpage": None,
+    "what_did_user_do": None,
+    "where_did_they_come_from": None,
+}
+
+# Spaltennamen der Rohdateien, in der Reihenfolge der Dimensionen/Metriken
+# der Looker-Antwort (aus TABLE_SPECS, ohne die laufende Nummer "eid").
+WIDGET_COLUMNS = {widget: spec.value_columns for widget, spec in TABLE_SPECS.items()}
+
+# Position einer Datums-Dimension ("JJJJMMTT") in den Antwortzeilen. Nur
+# Widgets, deren Abfrage nach Datum aufgeschlüsselt ist, können im
+# Zeitraum-Modus für mehrere Tage auf einmal geladen und danach pro Tag
+# aufgeteilt werden; alle anderen werden weiter Tag für Tag ausgewählt.
+# Auch diese Positionen schlägt --discover-components vor; solange keine
+# eingetragen ist, bleibt der Zeitraum-Modus in App und CLI ausgeblendet.
+WIDGET_DATE_COLUMNS = {
+    "landingpage": None,
+    "what_did_user_do": None,
+    "where_did_they_come_from": None,
+}
+
+# Dieselben Nachbearbeitungen wie in den DOM-Scrapern.
+WIDGET_NORMALISERS = {widget: spec.normalisers for widget, spec in TABLE_SPECS.items()}
+
+
+def enable_performance_logging(options):
+    """
+    Aktiviert das Performance-Log in den ChromeOptions (Network-Events).
+    """
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def clear_performance_log(driver):
+    """
+    Verwirft alle bisher gesammelten Log-Einträge, z. B. vor einem Datumswechsel.
+    """
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+
+def _strip_xssi(body: str) -> str:
+    body = body.lstrip()
+    if body.startswith(XSSI_PREFIX):
+        body = body[len(XSSI_PREFIX):]
+    return body
+
+
+def _component_ids(post_data: str) -> list:
+    """
+    Liest die Komponenten-IDs aus dem Request-Body, in Reihenfolge der Abfragen.
+    """
+    try:
+        payload = json.loads(post_data)
+    except (TypeError, ValueError):
+        return []
+    ids = []
+    for request in payload.get("dataRequest", []):
+        context = request.get("requestContext", {}).get("reportContext", {})
+        ids.append(context.get("componentId"))
+    return ids
+
+
+def _column_values(column: dict) -> list:
+    for key, value in column.items():
+        if key.endswith("Column") and isinstance(value, dict):
+            return value.get("values", [])
+    return []
+
+
+def decode_data_response(body: str) -> list:
+    """
+    Wandelt eine batchedDataV2-Antwort in eine Liste von Tabellen um.
+    Jede Tabelle ist eine Liste von Zeilen (Listen von Werten).
+    """
+    payload = json.loads(_strip_xssi(body))
+    tables = []
+    for response in payload.get("dataResponse", []):
+        rows = []
+        for subset in response.get("dataSubset", []):
+            dataset = subset.get("dataset", {}).get("tableDataset", {})
+            columns = [_column_values(col) for col in dataset.get("column", [])]
+            if columns:
+                rows.extend(list(row) for row in zip(*columns))
+        tables.append(rows)
+    return tables
+
+
+def tables_from_response(post_data: str, body: str) -> dict:
+    """
+    Ordnet die Tabellen einer Antwort den Komponenten-IDs aus dem
+    zugehörigen Request-Body zu: {component_id: [zeilen, ...]}.
+    """
+    return {
+        cid: rows
+        for cid, rows in zip(_component_ids(post_data), decode_data_response(body))
+        if cid
+    }
+
+
+def capture_data_responses(driver, component_ids=None, timeout: float = 15, poll: float = 0.5,
+                           responses: list = None) -> dict:
+    """
+    Sammelt die Datenantworten aus dem Performance-Log.
+    Gibt {component_id: [zeilen, ...]} zurück. Mit component_ids wird
+    höchstens `timeout` Sekunden gewartet, bis alle eingetroffen sind; ohne
+    wird nur das bisher gesammelte Log ausgewertet. In `responses` werden
+    die rohen Anfragen/Antworten ({"postData", "body"}) gesammelt.
+    """
+    wanted = {cid for cid in (component_ids or []) if cid}
+    requests = {}
+    finished = []
+    tables = {}
+    deadline = time.monotonic() + timeout
+
+    while True:
+        for entry in driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+
+            if method == "Network.requestWillBeSent":
+                request = params.get("request", {})
+                if DATA_ENDPOINT in request.get("url", ""):
+                    requests[params["requestId"]] = request.get("postData")
+            elif method == "Network.loadingFinished" and params.get("requestId") in requests:
+                finished.append(params["requestId"])
+
+        for request_id in finished:
+            post_data = requests.pop(request_id, None)
+            if post_data is None:
+                try:
+                    post_data = driver.execute_cdp_cmd(
+                        "Network.getRequestPostData", {"requestId": request_id}
+                    ).get("postData")
+                except Exception:
+                    post_data = None
+            try:
+                body = driver.execute_cdp_cmd(
+                    "Network.getResponseBody", {"requestId": request_id}
+                ).get("body", "")
+                tables.update(tables_from_response(post_data, body))
+            except Exception as e:
+                print(f"⚠️ Antwort {request_id} nicht lesbar: {e}")
+                continue
+            if responses is not None:
+                responses.append({"postData": post_data, "body": body})
+        finished = []
+
+        if not wanted or wanted.issubset(tables):
+            break
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(poll)
+
+    return tables
+
+
+# So viele Zeilen je Tabelle reichen für den Abgleich Mitschnitt ↔ DOM
+MATCH_ROWS = 10
+
+
+def find_date_column(records, day):
+    """
+    Position der Spalte, die in jeder Zeile `day` enthält (Datums-Dimension
+    einer Ein-Tages-Antwort), sonst None.
+    """
+    if not records:
+        return None
+    for index in range(len(records[0])):
+        if all(len(values) > index and _parse_day(values[index]) == day for values in records):
+            return index
+    return None
+
+
+def _without_column(records, index):
+    return records if index is None else [values[:index] + values[index + 1:] for values in records]
+
+
+def match_components(tables: dict, dom_rows: dict, day=None) -> dict:
+    """
+    Sucht für jedes Widget die Komponente, deren Antwort (über
+    build_widget_rows) dieselben ersten Zeilen ergibt wie der DOM-Scraper.
+    `dom_rows` ist {widget: [zeilen-dicts]}. Mit `day` wird eine
+    Datums-Dimension (find_date_column) vor dem Vergleich entfernt.
+    Gibt {widget: component_id} für alle eindeutig gefundenen Widgets zurück.
+    """
+    matches = {}
+    for widget, rows in dom_rows.items():
+        columns = WIDGET_COLUMNS.get(widget)
+        if not columns or not rows:
+            continue
+        wanted = [[row.get(name) for name in columns] for row in rows[:MATCH_ROWS]]
+        found = []
+        for cid, records in tables.items():
+            records = records[:len(wanted)]
+            if day is not None:
+                records = _without_column(records, find_date_column(records, day))
+            built = build_widget_rows(widget, records, "")
+            if [[row.get(name) for name in columns] for row in built] == wanted:
+                found.append(cid)
+        if len(found) == 1:
+            matches[widget] = found[0]
+    return matches
+
+
+def date_columns(tables: dict, matches: dict, day) -> dict:
+    """
+    Datums-Dimensionen der zugeordneten Komponenten einer Ein-Tages-Antwort:
+    {widget: position} – der Vorschlag für WIDGET_DATE_COLUMNS.
+    """
+    found = {}
+    for widget, cid in matches.items():
+        index = find_date_column(tables.get(cid, []), day)
+        if index is not None:
+            found[widget] = index
+    return found
+
+
+def describe_captured_components(tables: dict, matches: dict = None, dates: dict = None) -> None:
+    """
+    Gibt die mitgeschnittenen Komponenten mit Beispielzeilen aus und, wenn
+    `matches` ({widget: component_id}) gefunden wurden, einen Vorschlag für
+    WIDGET_COMPONENTS (und mit `dates` für WIDGET_DATE_COLUMNS).
+    """
+    widgets = {cid: widget for widget, cid in (matches or {}).items()}
+    for cid, rows in tables.items():
+        preview = rows[0] if rows else []
+        label = f" → {widgets[cid]}" if cid in widgets else ""
+        print(f"🧩 {cid}{label}: {len(rows)} Zeilen, z. B. {preview}")
+    if matches is None:
+        return
+    missing = [widget for widget in WIDGET_COMPONENTS if widget not in matches]
+    print("📋 Vorschlag für WIDGET_COMPONENTS:")
+    for widget in WIDGET_COMPONENTS:
+        print(f'    "{widget}": {matches[widget]!r},' if widget in matches else f'    "{widget}": None,')
+    if missing:
+        print(f"⚠️ Ohne eindeutige Zuordnung: {', '.join(missing)}")
+    if dates:
+        print("📋 Vorschlag für WIDGET_DATE_COLUMNS (Zeitraum-Modus):")
+        for widget in WIDGET_DATE_COLUMNS:
+            print(f'    "{widget}": {dates.get(widget)!r},')
+
+
+def format_number(value) -> str:
+    """
+    Formatiert einen Zahlenwert wie die Tabellenanzeige im Dashboard
+    (Tausenderpunkt, Dezimalkomma).
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return "" if value is None else str(value)
+    if number.is_integer():
+        return f"{int(number):,}".replace(",", ".")
+    text = f"{number:,.2f}".rstrip("0")  # Dashboard zeigt "4,5", nicht "4,50"
+    return text.replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def rows_for_widget(tables: dict, widget: str, date_str: str):
+    """
+    Baut aus den mitgeschnittenen Antworten dieselben Zeilen-Dicts wie der
+    DOM-Scraper. Gibt None zurück, wenn für das Widget nichts vorliegt.
+    """
+    component_id = WIDGET_COMPONENTS.get(widget)
+    if not component_id or component_id not in tables:
+        return None
+
+    data = build_widget_rows(widget, tables[component_id], date_str)
+    print(f"✅ {len(data)} Datensätze für {widget} aus dem Netzwerk-Mitschnitt.")
+    return data
+
+
+def build_widget_rows(widget: str, records, date_str: str) -> list:
+    """
+    Wandelt Wertelisten (Reihenfolge wie WIDGET_COLUMNS) in die Zeilen-Dicts
+    der Rohdatei um. Zahlen werden wie in der Tabellenanzeige formatiert.
+    """
+    columns = WIDGET_COLUMNS[widget]
+    normalisers = WIDGET_NORMALISERS.get(widget, {})
+    data = []
+    for i, values in enumerate(records, 1):
+        entry = {"datum": date_str, "eid": f"{i}."}
+        for name, value in zip(columns, values):
+            text = value if isinstance(value, str) else format_number(value)
+            entry[name] = normalisers[name](text) if name in normalisers else text
+        data.append(entry)
+    return data
+
+
+def network_widgets() -> list:
+    """Widgets mit eingetragener Komponenten-ID (Netzwerk-Modus)."""
+    return [widget for widget, component_id in WIDGET_COMPONENTS.items() if component_id]
+
+
+def date_split_widgets() -> list:
+    """Widgets mit Komponenten-ID und Datums-Dimension (Zeitraum-Modus)."""
+    return [
+        widget for widget, column in WIDGET_DATE_COLUMNS.items()
+        if column is not None and WIDGET_COMPONENTS.get(widget)
+    ]
+
+
+def _parse_day(value):
+    digits = "".join(ch for ch in str(value) if ch.isdigit())[:8]
+    try:
+        return date(int(digits[:4]), int(digits[4:6]), int(digits[6:8]))
+    except ValueError:
+        return None
+
+
+def split_rows_by_date(tables: dict, widget: str, days) -> dict:
+    """
+    Teilt die Antwort eines über mehrere Tage geladenen Widgets anhand der
+    Datums-Dimension in Tageszeilen auf: {tag: [zeilen-dicts, ...]}.
+    Tage ohne Zeilen bekommen eine leere Liste. Gibt None zurück, wenn für
+    das Widget nichts vorliegt.
+    """
+    component_id = WIDGET_COMPONENTS.get(widget)
+    column = WIDGET_DATE_COLUMNS.get(widget)
+    if column is None or not component_id or component_id not in tables:
+        return None
+
+    records = {day: [] for day in days}
+    for values in tables[component_id]:
+        day = _parse_day(values[column])
+        if day in records:
+            records[day].append(values[:column] + values[column + 1:])
+    return {
+        day: build_widget_rows(widget, rows, day.isoformat())
+        for day, rows in records.items()
+    }
@@ -0,0 +1,132 @@
+import pandas as pd
+
+from src.utils.timing_utils import span
+
+
+# ========== Werte beim Einlesen typisieren ==========
+#
+# Die Rohdateien enthalten die Werte so, wie das Dashboard sie anzeigt:
+# "00:01:11", "50.00%", "1.381" (Tausenderpunkt) oder "1." als laufende
+# Nummer. Die Aufbereitung wandelt jede Spalte einmal spaltenweise (pandas,
+# ohne Schleife pro Zeile) in Zahlen, Datum und Sekunden um – die bereinigten
+# CSVs, Parquet-Dateien und Notebooks arbeiten danach nur noch mit Zahlen.
+
+# Spalten, die beim Typisieren einen Namen mit Einheit bekommen
+COLUMN_RENAMES = {
+    "user_sessions": {
+        "durchschn_zeit_auf_der_seite": "zeit_in_sekunden",
+        "absprungrate": "absprungrate_in_prozent",
+    },
+}
+
+# Spaltentypen je bereinigter Datei (Name ohne .csv, Spalten nach Umbenennung):
+#   date     "2024-01-31"          -> Datum
+#   int      "1.234" / "12."       -> Ganzzahl (Tausenderpunkt, laufende Nummer)
+#   float    "4.5"                 -> Kommazahl
+#   percent  "50.00%"              -> Kommazahl (Prozentwert, 50.0)
+#   seconds  "00:01:11"            -> Ganzzahl (Sekunden, 71)
+#   category Text mit wenigen Werten
+#   string   freier Text
+CLEAN_SCHEMAS = {
+    "landing_page_views": [
+        ("datum", "date"), ("eid", "int"), ("seitentitel", "category"), ("aufrufe", "int"),
+    ],
+    "user_sessions": [
+        ("datum", "date"), ("seitenaufrufe", "int"), ("nutzer_insgesamt", "int"),
+        ("zeit_in_sekunden", "seconds"), ("absprungrate_in_prozent", "percent"),
+        ("seiten_sitzung", "float"),
+    ],
+    "user_events": [
+        ("datum", "date"), ("eid", "int"), ("name_des_events", "category"),
+        ("event_label", "category"), ("aktive_nutzer", "int"), ("ereignisanzahl", "int"),
+    ],
+    "traffic_sources": [
+        ("datum", "date"), ("eid", "int"), ("quelle", "category"), ("sitzungen", "int"),
+        ("aufrufe", "int"), ("aufrufe_pro_sitzung", "float"),
+    ],
+    "device_usage": [("datum", "date"), ("kategorie", "category"), ("wert", "int")],
+    "traffic_source_chart": [("datum", "date"), ("kategorie", "category"), ("wert", "int")],
+    "daily_visitors_chart": [("datum", "date"), ("kategorie", "category"), ("wert", "int")],
+}
+
+# Anzeigewerte ohne Zahl
+MISSING_VALUES = ["", "Keine Daten"]
+
+
+def _to_int(text: pd.Series) -> pd.Series:
+    digits = text.str.rstrip(".").str.replace(".", "", regex=False)
+    return pd.to_numeric(digits, errors="coerce").astype("Int64")
+
+
+def _to_float(text: pd.Series) -> pd.Series:
+    return pd.to_numeric(text.str.replace(",", ".", regex=False), errors="coerce").astype("float64")
+
+
+def _to_percent(text: pd.Series) -> pd.Series:
+    return _to_float(text.str.rstrip("%").str.strip())
+
+
+def _to_seconds(text: pd.Series) -> pd.Series:
+    parts = text.str.extract(r"^(\d+):(\d{2}):(\d{2})$").astype("float64")
+    return (parts[0] * 3600 + parts[1] * 60 + parts[2]).astype("Int32")
+
+
+def _to_date(text: pd.Series) -> pd.Series:
+    return pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+
+
+PARSERS = {
+    "date": _to_date,
+    "int": _to_int,
+    "float": _to_float,
+    "percent": _to_percent,
+    "seconds": _to_seconds,
+    "category": lambda text: text.astype("category"),
+    "string": lambda text: text,
+}
+
+
+def normalise_frame(frame: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """
+    Typisiert die Textspalten einer Tabelle nach CLEAN_SCHEMAS. Werte, die
+    sich nicht umwandeln lassen ("Keine Daten", leer), werden zu NA.
+    Spalten ohne Schema-Eintrag bleiben unverändert hinten angehängt.
+    """
+    frame = frame.rename(columns=COLUMN_RENAMES.get(table_name, {}))
+    schema = CLEAN_SCHEMAS[table_name]
+    typed = {}
+    with span("normalise", table=table_name):
+        for name, kind in schema:
+            if name in frame:
+                text = frame[name].astype(str).str.strip()
+                text = text.where(~text.isin(MISSING_VALUES))
+            else:
+                text = pd.Series(pd.NA, index=frame.index, dtype="object")
+            typed[name] = PARSERS[kind](text)
+        for name in frame.columns:
+            if name not in typed:
+                typed[name] = frame[name]
+    return pd.DataFrame(typed, index=frame.index)
+
+
+def type_errors(frame: pd.DataFrame, typed: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """
+    Markiert Werte, die nicht leer/"Keine Daten" sind und sich trotzdem nicht
+    in den Spaltentyp umwandeln ließen. Gibt je Schema-Spalte (nach
+    Umbenennung) eine Wahr/Falsch-Spalte zurück.
+    """
+    frame = frame.rename(columns=COLUMN_RENAMES.get(table_name, {}))
+    errors = {}
+    for name, kind in CLEAN_SCHEMAS[table_name]:
+        if name not in frame or kind in ("category", "string"):
+            continue
+        text = frame[name].astype(str).str.strip()
+        errors[name] = ~text.isin(MISSING_VALUES) & typed[name].isna()
+    return pd.DataFrame(errors, index=frame.index)
+
+
+def clean_csv_text(frame: pd.DataFrame, header: bool = True, delimiter: str = ";") -> str:
+    """Die typisierte Tabelle als Text der bereinigten CSV (Zahlen mit Punkt, Datum ISO)."""
+    return frame.to_csv(
+        sep=delimiter, index=False, header=header, lineterminator="\n", date_format="%Y-%m-%d",
+    )
@@ -0,0 +1,68 @@
+import lxml.html
+
+from src.utils.timing_utils import span
+
+
+# ========== Seiten-Snapshot für die Kreisdiagramme ==========
+#
+# driver.page_source wird pro Datum nur einmal geholt und einmal mit lxml
+# geparst. Die ng2-piechart-component-Knoten werden dabei nach ihrem
+# class-Attribut vorsortiert, sodass jeder Diagramm-Extractor direkt auf
+# "seine" Komponente zugreifen kann.
+
+
+class PageSnapshot:
+    def __init__(self, driver=None, html: str = None):
+        """
+        driver — WebDriver, dessen aktueller Seitenquelltext gelesen wird
+        html   — alternativ bereits vorliegender HTML-Text
+        """
+        with span("page_source"):
+            self.html = html if html is not None else driver.page_source
+        with span("page_parse"):
+            self.tree = lxml.html.fromstring(self.html)
+        self._piecharts = {}
+        for node in self.tree.iter("ng2-piechart-component"):
+            class_name = " ".join((node.get("class") or "").split())
+            self._piecharts.setdefault(class_name, []).append(node)
+
+    def piecharts(self, class_name: str) -> list:
+        """Alle Kreisdiagramm-Komponenten mit genau diesem class-Attribut."""
+        return self._piecharts.get(class_name, [])
+
+    def piechart_rows(self, class_name: str, index: int, date_str: str) -> list:
+        """
+        Liest die tabellarische Darstellung der `index`-ten Komponente mit
+        class `class_name`. Gibt Liste von Dicts zurück: [{"datum", "kategorie", "wert"}, ...]
+        """
+        components = self.piecharts(class_name)
+        if len(components) <= index:
+            print(f"❌ Keine Komponente mit class '{class_name}' gefunden.")
+            return []
+
+        table_divs = components[index].xpath(
+            './/div[contains(@aria-label, "tabellarische Darstellung")]'
+        )
+        if not table_divs:
+            print("❌ Keine Tabelle im Diagramm gefunden.")
+            return []
+
+        tables = table_divs[0].xpath(".//table")
+        if not tables:
+            print("❌ Keine <table> gefunden.")
+            return []
+
+        # Zeilen extrahieren (ab Zeile 1, weil Zeile 0 der Header ist)
+        data = []
+        for tr in tables[0].xpath(".//tr")[1:]:
+            tds = tr.xpath(".//td")
+            if len(tds) < 2:
+                continue
+            data.append(
+                {
+                    "datum": date_str,
+                    "kategorie": tds[0].text_content().strip(),
+                    "wert": tds[1].text_content().strip(),
+                }
+            )
+        return data
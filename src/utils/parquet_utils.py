@@ -0,0 +1,111 @@
+import os
+
+from src.utils.normalise_utils import CLEAN_SCHEMAS
+from src.utils.timing_utils import span
+
+
+# ========== Parquet-Ausgabe der bereinigten Daten ==========
+#
+# Neben den Semikolon-CSVs im clean-Ordner schreibt die Aufbereitung pro
+# Tabelle einen nach Monat partitionierten Parquet-Datensatz mit festem
+# Arrow-Schema:  src/data/parquet/<tabelle>/monat=JJJJ-MM/part-0.parquet
+# Notebooks, Power BI und DB-Importe lesen so nur die benötigten Monate und
+# Spalten – mit den Typen aus normalise_utils.CLEAN_SCHEMAS.
+
+PARQUET_FOLDER = os.path.join("src", "data", "parquet")
+PARTITION_COLUMN = "monat"
+
+
+def arrow_schema(table_name: str):
+    """Das Arrow-Schema einer bereinigten Tabelle (inkl. Partitionsspalte)."""
+    import pyarrow as pa
+
+    types = {
+        "date": pa.date32(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "percent": pa.float64(),
+        "seconds": pa.int32(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "string": pa.string(),
+    }
+    fields = []
+    for name, kind in CLEAN_SCHEMAS[table_name]:
+        metadata = {"unit": "s"} if kind == "seconds" else ({"unit": "%"} if kind == "percent" else None)
+        fields.append(pa.field(name, types[kind], metadata=metadata))
+    fields.append(pa.field(PARTITION_COLUMN, pa.string()))
+    return pa.schema(fields)
+
+
+def _arrow_table(frame, table_name: str):
+    """Typisierte Tabelle -> Arrow-Tabelle mit Schema und Partitionsspalte."""
+    import pyarrow as pa
+
+    columns = [name for name, _ in CLEAN_SCHEMAS[table_name]]
+    frame = frame[columns].assign(**{
+        "datum": frame["datum"].dt.date,
+        PARTITION_COLUMN: frame["datum"].dt.strftime("%Y-%m").fillna("unbekannt"),
+    })
+    return pa.Table.from_pandas(frame, schema=arrow_schema(table_name), preserve_index=False)
+
+
+def _write_partitions(table, target: str) -> None:
+    import pyarrow.parquet as pq
+
+    pq.write_to_dataset(
+        table,
+        root_path=target,
+        partition_cols=[PARTITION_COLUMN],
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
+
+
+def write_parquet_dataset(frame, table_name: str, parquet_folder: str = PARQUET_FOLDER) -> str:
+    """
+    Schreibt eine typisierte Tabelle (normalise_frame) als monatsweise
+    partitionierten Parquet-Datensatz. Gibt den Ordner zurück oder None,
+    wenn es für die Tabelle kein Schema gibt. Vorhandene Monate werden ersetzt.
+    """
+    if table_name not in CLEAN_SCHEMAS:
+        return None
+
+    target = os.path.join(parquet_folder, table_name)
+    with span("parquet_write", table=table_name):
+        _write_partitions(_arrow_table(frame, table_name), target)
+    return target
+
+
+def append_parquet_dataset(frame, table_name: str, parquet_folder: str = PARQUET_FOLDER) -> str:
+    """
+    Ergänzt einen vorhandenen Datensatz um neue Zeilen. Nur die Monate, in
+    die neue Zeilen fallen, werden gelesen und neu geschrieben.
+    """
+    if table_name not in CLEAN_SCHEMAS:
+        return None
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    target = os.path.join(parquet_folder, table_name)
+    schema = arrow_schema(table_name)
+    with span("parquet_append", table=table_name):
+        new = _arrow_table(frame, table_name)
+        parts = []
+        for month in sorted(set(new.column(PARTITION_COLUMN).to_pylist())):
+            folder = os.path.join(target, f"{PARTITION_COLUMN}={month}")
+            if not os.path.isdir(folder):
+                continue
+            old = pq.read_table(folder)
+            old = old.append_column(PARTITION_COLUMN, pa.array([month] * old.num_rows, pa.string()))
+            parts.append(old.select(schema.names).cast(schema))
+        _write_partitions(pa.concat_tables(parts + [new]), target)
+    return target
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
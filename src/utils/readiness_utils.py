@@ -0,0 +1,148 @@
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# ========== Warten auf fertig gerenderte Widgets ==========
+#
+# Statt fester time.sleep-Pausen warten wir auf konkrete Signale:
+#   1. keine sichtbaren Lade-Indikatoren mehr,
+#   2. der Widget-Fingerprint hat sich nach einem Datumswechsel geändert,
+#   3. das Netzwerk ist ruhig (seit `quiet` Sekunden keine neue Ressource).
+# Die bisherigen Pausen bleiben nur noch als Obergrenze (timeout) bestehen.
+#
+# Der Resource-Timing-Puffer des Browsers nimmt standardmäßig nur 250 Einträge
+# auf; danach kommen keine neuen hinzu und das Netzwerk wirkt dauerhaft ruhig.
+# Jede Abfrage merkt sich daher das letzte Antwortende in window und leert den
+# Puffer; reset_resource_timings() setzt den Stand vor jeder Datumswahl zurück.
+
+# Obergrenze für Einträge zwischen zwei Abfragen (Browser-Standard: 250)
+RESOURCE_BUFFER_SIZE = 1000
+
+LOADING_SELECTORS = [
+    "md-progress-circular",
+    "mat-progress-spinner",
+    "mat-spinner",
+    ".lego-loading",
+    ".loading-indicator",
+    ".progress-spinner",
+]
+
+# Text der Kennzahlen-Kacheln, wenn der Bericht für den Zeitraum leer ist
+NO_DATA_TEXT = "Keine Daten"
+
+_STATE_JS = """
+const selectors = arguments[0];
+const noDataText = arguments[1];
+let loading = 0;
+for (const sel of selectors) {
+    for (const el of document.querySelectorAll(sel)) {
+        if (el.offsetParent !== null) { loading++; }
+    }
+}
+const parts = [];
+for (const table of document.querySelectorAll('.table')) {
+    parts.push(Array.from(table.querySelectorAll('div.cell'), c => c.innerText).slice(0, 10).join('|'));
+}
+const labels = Array.from(document.querySelectorAll('div.value-label'), l => (l.innerText || '').trim());
+parts.push(...labels);
+for (const pie of document.querySelectorAll('ng2-piechart-component table')) {
+    parts.push(pie.innerText);
+}
+const resources = performance.getEntriesByType('resource');
+let lastEnd = window.__readyLastResponseEnd || 0;
+for (const r of resources) { if (r.responseEnd > lastEnd) { lastEnd = r.responseEnd; } }
+window.__readyLastResponseEnd = lastEnd;
+performance.clearResourceTimings();
+return {
+    loading: loading,
+    fingerprint: parts.join('\\u241e'),
+    resources: resources.length,
+    idleMs: performance.now() - lastEnd,
+    noData: labels.length > 0 && labels.every(text => text === noDataText),
+};
+"""
+
+
+def dashboard_state(driver) -> dict:
+    """
+    Liest Lade-Indikatoren, Widget-Fingerprint und Netzwerkstatus in einem
+    execute_script-Aufruf.
+    """
+    return driver.execute_script(_STATE_JS, LOADING_SELECTORS, NO_DATA_TEXT) or {}
+
+
+_RESET_TIMINGS_JS = """
+performance.setResourceTimingBufferSize(arguments[0]);
+performance.clearResourceTimings();
+window.__readyLastResponseEnd = performance.now();
+"""
+
+
+def reset_resource_timings(driver) -> None:
+    """
+    Leert den Resource-Timing-Puffer direkt vor einer Datumswahl. Die Wahl
+    selbst zählt als letzte Aktivität – das Netzwerk muss danach erst
+    `quiet` Sekunden ruhig sein.
+    """
+    driver.execute_script(_RESET_TIMINGS_JS, RESOURCE_BUFFER_SIZE)
+
+
+def widget_fingerprint(driver) -> str:
+    """Fingerprint aller sichtbaren Widgets (Tabellen, Kennzahlen, Kreisdiagramme)."""
+    return dashboard_state(driver).get("fingerprint", "")
+
+
+def day_has_no_data(driver) -> bool:
+    """
+    Schnelltest direkt nach der Datumswahl: Zeigen alle Kennzahlen-Kacheln
+    "Keine Daten", ist der ganze Tag leer (Feiertag o. ä.).
+    """
+    return bool(dashboard_state(driver).get("noData"))
+
+
+def wait_for_dashboard_ready(driver, previous_fingerprint: str = None, timeout: float = 8,
+                             quiet: float = 0.5, poll: float = 0.25) -> bool:
+    """
+    Wartet, bis das Dashboard neu gerendert ist: keine Lade-Indikatoren,
+    Widgets vorhanden und (falls angegeben) anderer Fingerprint als vorher,
+    Netzwerk seit `quiet` Sekunden ruhig.
+    Gibt False zurück, wenn nach `timeout` Sekunden noch nicht alles erfüllt
+    ist – der Aufrufer macht dann wie früher nach der festen Pause weiter.
+    """
+    def ready(d):
+        state = dashboard_state(d)
+        if state.get("loading") or not state.get("fingerprint"):
+            return False
+        if previous_fingerprint is not None and state["fingerprint"] == previous_fingerprint:
+            return False
+        return state.get("idleMs", 0) >= quiet * 1000
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(ready)
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_render_idle(driver, timeout: float = 5, quiet: float = 0.5, poll: float = 0.25) -> bool:
+    """
+    Wartet nach einem Seitenwechsel nur noch, bis Lade-Indikatoren weg sind
+    und das Netzwerk ruhig ist (der Inhaltswechsel ist schon geprüft).
+    """
+    return wait_for_dashboard_ready(driver, None, timeout=timeout, quiet=quiet, poll=poll)
+
+
+def wait_for_process_exit(driver, timeout: float = 5, poll: float = 0.1) -> bool:
+    """
+    Wartet nach driver.quit(), bis der chromedriver-Prozess beendet ist.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return True
+    deadline = time.monotonic() + timeout
+    while process.poll() is None:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+    return True
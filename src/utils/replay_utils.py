@@ -0,0 +1,297 @@
+import csv
+import json
+import os
+from html import escape
+
+import lxml.html
+
+from src.utils.network_capture_utils import DATA_ENDPOINT
+from src.utils.readiness_utils import NO_DATA_TEXT, _STATE_JS
+from src.utils.table_utils import _CLICK_NEXT_JS, _READ_TABLE_JS
+
+
+# ========== Aufzeichnen & Abspielen von Dashboard-Seiten ==========
+#
+# RecordingDriver legt sich um den echten WebDriver und merkt sich pro Datum
+# alles, was die Extractors lesen: page_source, jede besuchte Tabellenseite,
+# die Kennzahlen (div.value-label) und die mitgeschnittenen Datenantworten.
+# ReplayDriver beantwortet dieselben Aufrufe aus der gespeicherten Datei –
+# so lassen sich die Scraper ohne Google-Zugang ausführen und messen.
+#
+# Gespeichert wird nur, was die Extractors brauchen: aus dem HTML die
+# Kreisdiagramm-Komponenten, aus dem Performance-Log die batchedDataV2-Anfragen
+# (URL ohne Query, Post-Daten, keine Header/Cookies). Angemeldetes Konto und
+# Sitzungs-Cookies landen so nicht in den Fixtures (die trotzdem nicht ins
+# Repository gehören, siehe .gitignore).
+
+FIXTURE_DIR = os.path.join("src", "data", "fixtures")
+
+# CDP-Antworten, die capture_data_responses abfragt
+RECORDED_CDP_COMMANDS = ("Network.getRequestPostData", "Network.getResponseBody")
+
+
+def fixture_path(scrape_date, fixture_dir: str = FIXTURE_DIR) -> str:
+    return os.path.join(fixture_dir, f"{scrape_date.isoformat()}.json")
+
+
+def _empty_recording() -> dict:
+    return {"html": None, "tables": {}, "value_labels": [], "performance": [], "cdp": {}, "rows": {}}
+
+
+def _piechart_components(html: str) -> str:
+    """Nur die Kreisdiagramm-Komponenten der Seite (ohne Konto, Menüs, Skripte)."""
+    try:
+        tree = lxml.html.fromstring(html)
+    except Exception:
+        return "<html></html>"
+    components = [
+        lxml.html.tostring(node, encoding="unicode") for node in tree.iter("ng2-piechart-component")
+    ]
+    return "<html><body>" + "".join(components) + "</body></html>"
+
+
+def _data_event(entry: dict, data_requests: set):
+    """
+    Reduziert einen Performance-Log-Eintrag auf das, was die Replay braucht:
+    batchedDataV2-Anfrage (URL ohne Query, Post-Daten) bzw. deren Ende.
+    Alle anderen Einträge (auch *ExtraInfo mit Cookie-Headern) -> None.
+    """
+    try:
+        message = json.loads(entry["message"])["message"]
+    except (KeyError, TypeError, ValueError):
+        return None
+    method = message.get("method")
+    params = message.get("params", {})
+    request_id = params.get("requestId")
+    if method == "Network.requestWillBeSent":
+        request = params.get("request", {})
+        url = request.get("url", "")
+        if DATA_ENDPOINT not in url:
+            return None
+        data_requests.add(request_id)
+        slim = {"requestId": request_id, "request": {"url": url.split("?")[0], "postData": request.get("postData")}}
+    elif method == "Network.loadingFinished" and request_id in data_requests:
+        slim = {"requestId": request_id}
+    else:
+        return None
+    return {"message": json.dumps({"message": {"method": method, "params": slim}})}
+
+
+class RecordingDriver:
+    def __init__(self, driver):
+        """
+        driver — echter WebDriver, an den alle Aufrufe weitergereicht werden
+        """
+        self._driver = driver
+        self.recording = _empty_recording()
+        self._data_requests = set()
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def reset(self):
+        """Beginnt eine neue Aufzeichnung (vor jedem Datum)."""
+        self.recording = _empty_recording()
+        self._data_requests = set()
+
+    @property
+    def page_source(self):
+        html = self._driver.page_source
+        self.recording["html"] = _piechart_components(html)
+        return html
+
+    def execute_script(self, script, *args):
+        result = self._driver.execute_script(script, *args)
+        if script == _READ_TABLE_JS and result and result.get("cells") is not None:
+            pages = self.recording["tables"].setdefault(str(args[0]), [])
+            if not pages or pages[-1]["cells"] != result["cells"]:
+                pages.append(result)
+        return result
+
+    def find_elements(self, by, value):
+        elements = self._driver.find_elements(by, value)
+        if value == "div.value-label":
+            self.recording["value_labels"] = [element.text for element in elements]
+        return elements
+
+    def get_log(self, log_type):
+        entries = self._driver.get_log(log_type)
+        if log_type == "performance":
+            for entry in entries:
+                event = _data_event(entry, self._data_requests)
+                if event is not None:
+                    self.recording["performance"].append(event)
+        return entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        result = self._driver.execute_cdp_cmd(cmd, params)
+        if cmd in RECORDED_CDP_COMMANDS and params.get("requestId") in self._data_requests:
+            self.recording["cdp"][f"{cmd}:{params.get('requestId', '')}"] = result
+        return result
+
+    def record_rows(self, widget: str, rows: list) -> None:
+        """Merkt sich die gespeicherten Zeilen eines Widgets als Sollwert für die Replay-Tests."""
+        self.recording["rows"][widget] = [dict(row) for row in rows]
+
+    def save(self, scrape_date, fixture_dir: str = FIXTURE_DIR) -> str:
+        """Schreibt die Aufzeichnung des Datums als JSON-Fixture."""
+        os.makedirs(fixture_dir, exist_ok=True)
+        path = fixture_path(scrape_date, fixture_dir)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.recording, f, ensure_ascii=False)
+        return path
+
+
+class _ReplayElement:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ReplayDriver:
+    def __init__(self, recording: dict):
+        """
+        recording — Aufzeichnung eines Datums (siehe RecordingDriver)
+        """
+        self.recording = recording
+        self._page = {}
+        self._performance_served = False
+
+    @classmethod
+    def load(cls, scrape_date, fixture_dir: str = FIXTURE_DIR):
+        with open(fixture_path(scrape_date, fixture_dir), encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def page_source(self):
+        return self.recording.get("html") or "<html></html>"
+
+    def execute_script(self, script, *args):
+        if script == _READ_TABLE_JS:
+            pages = self.recording["tables"].get(str(args[0]))
+            if not pages:
+                return {"tableCount": 0, "cells": None, "nextState": "missing"}
+            return pages[self._page.get(str(args[0]), 0)]
+        if script == _CLICK_NEXT_JS:
+            index = str(args[0])
+            pages = self.recording["tables"].get(index, [])
+            if self._page.get(index, 0) + 1 >= len(pages):
+                return False
+            self._page[index] = self._page.get(index, 0) + 1
+            return True
+        if script == _STATE_JS:
+            labels = self.recording.get("value_labels", [])
+            no_data = bool(labels) and all(text == NO_DATA_TEXT for text in labels)
+            return {"loading": 0, "fingerprint": "replay", "resources": 0, "idleMs": 1e9, "noData": no_data}
+        return None
+
+    def find_elements(self, by, value):
+        if value == "div.value-label":
+            return [_ReplayElement(text) for text in self.recording.get("value_labels", [])]
+        return []
+
+    def get_log(self, log_type):
+        if log_type != "performance" or self._performance_served:
+            return []
+        self._performance_served = True
+        return list(self.recording.get("performance", []))
+
+    def execute_cdp_cmd(self, cmd, params):
+        return self.recording.get("cdp", {}).get(f"{cmd}:{params.get('requestId', '')}", {})
+
+    def quit(self):
+        pass
+
+
+def list_fixtures(fixture_dir: str = FIXTURE_DIR) -> list:
+    """Alle aufgezeichneten Daten (ISO-Strings), sortiert."""
+    if not os.path.isdir(fixture_dir):
+        return []
+    return sorted(name[:-5] for name in os.listdir(fixture_dir) if name.endswith(".json"))
+
+
+# ========== Synthetische Aufzeichnung aus den Rohdaten ==========
+
+
+def _raw_rows(raw_folder: str, file_name: str, date_str: str) -> list:
+    path = os.path.join(raw_folder, file_name)
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter=";")
+        next(reader, None)
+        return [row[1:] for row in reader if row and row[0] == date_str]
+
+
+def _raw_dicts(raw_folder: str, file_name: str, date_str: str) -> list:
+    path = os.path.join(raw_folder, file_name)
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f, delimiter=";")
+        return [dict(row) for row in reader if row.get("datum") == date_str]
+
+
+def _table_pages(rows: list, page_size: int = 10) -> list:
+    pages = []
+    for start in range(0, max(len(rows), 1), page_size):
+        chunk = rows[start:start + page_size]
+        last = start + page_size >= len(rows)
+        pages.append({
+            "tableCount": 5,
+            "cells": [value for row in chunk for value in row],
+            "nextState": "disabled" if last else "enabled",
+        })
+    return pages
+
+
+def _piechart_html(class_name: str, rows: list) -> str:
+    body = "".join(
+        f"<tr><td>{escape(row[0])}</td><td>{escape(row[1])}</td></tr>" for row in rows
+    )
+    return (
+        f'<ng2-piechart-component class="{class_name}">'
+        f'<div aria-label="Diagramm, tabellarische Darstellung">'
+        f"<table><tr><th>Kategorie</th><th>Wert</th></tr>{body}</table>"
+        f"</div></ng2-piechart-component>"
+    )
+
+
+def synthetic_recording(scrape_date, raw_folder: str) -> dict:
+    """
+    Baut aus den Rohdaten eines Datums eine Aufzeichnung, wie sie der
+    RecordingDriver liefern würde – für Benchmarks ohne Live-Aufnahme.
+    """
+    date_str = scrape_date.isoformat()
+    sources = [
+        row[:4] + [row[4].replace(".", ",")]
+        for row in _raw_rows(raw_folder, "where_did_they_come_from.csv", date_str)
+    ]
+    behaviour = _raw_rows(raw_folder, "user_behaviors.csv", date_str)
+    if behaviour:
+        views, users, duration, bounce, pages = behaviour[0]
+        value_labels = [views, users, duration, bounce.replace(".", ",").replace("%", " %"), pages.replace(".", ",")]
+    else:
+        value_labels = [NO_DATA_TEXT] * 5
+
+    html = "<html><body>" + "".join([
+        _piechart_html("piechart gviz selectable", _raw_rows(raw_folder, "where_new_visitors_come_from_chart.csv", date_str)),
+        _piechart_html("piechart gviz", _raw_rows(raw_folder, "what_devices_used_chart.csv", date_str)),
+        _piechart_html("piechart gviz", _raw_rows(raw_folder, "who_was_visiting_chart.csv", date_str)),
+    ]) + "</body></html>"
+
+    recording = _empty_recording()
+    recording.update({
+        "html": html,
+        "tables": {
+            "1": _table_pages(_raw_rows(raw_folder, "landingpage.csv", date_str)),
+            "3": _table_pages(sources),
+            "4": _table_pages(_raw_rows(raw_folder, "what_did_user_do.csv", date_str)),
+        },
+        "value_labels": value_labels,
+        # Sollwerte: genau die Zeilen der Rohdateien
+        "rows": {
+            name[:-4]: _raw_dicts(raw_folder, name, date_str)
+            for name in sorted(os.listdir(raw_folder)) if name.endswith(".csv")
+        },
+    })
+    return recording
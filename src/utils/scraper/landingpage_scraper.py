@@ -1,15 +1,9 @@
 import time
 from datetime import date, timedelta
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    TimeoutException,
-    StaleElementReferenceException,
-)
 from src.utils.csv_manager_utils import CSVFileHandler
+from src.utils.table_engine_utils import TABLE_SPECS, scrape_table
 from src.utils.calender_utils import select_date_range
 
 
@@ -17,97 +11,8 @@ from src.utils.calender_utils import select_date_range
 
 
 def extract_table_data(driver, date_str: str):
-    wait = WebDriverWait(driver, 10)
-    data = []
-    seen_fingerprints = set()
-
-    def get_cells():
-        all_tables = driver.find_elements(By.CSS_SELECTOR, ".table")
-        if len(all_tables) < 3:
-            raise Exception("❌ Erwartete Tabelle (Index 2) nicht gefunden.")
-        last_table = all_tables[1]
-        return last_table.find_elements(By.CSS_SELECTOR, "div.cell")
-
-    def safe_get_cells(retries=5, delay=1):
-        for attempt in range(retries):
-            try:
-                return get_cells()
-            except StaleElementReferenceException:
-                print(f"⚠️ Stale bei get_cells – Versuch {attempt + 1}")
-                time.sleep(delay)
-        raise Exception("❌ 5x StaleElement bei get_cells – Abbruch.")
-
-    def get_fingerprint(cells):
-        return tuple(cell.text.strip() for cell in cells[:10])
-
-    def wait_for_page_change(driver, old_fingerprint):
-        def changed(d):
-            try:
-                new_cells = safe_get_cells()
-                if len(new_cells) < 10:
-                    return False
-                return get_fingerprint(new_cells) != old_fingerprint
-            except:
-                return False
-
-        wait.until(changed)
-
-    while True:
-        try:
-            cells = safe_get_cells()
-        except Exception as e:
-            print(f"❌ Fehler beim Lesen der Zellen: {e}")
-            break
-
-        print(f"📦 {len(cells)} Zellen erkannt (Seite).")
-
-        fingerprint = get_fingerprint(cells)
-        if fingerprint in seen_fingerprints:
-            print("🔁 Wiederholte Seite erkannt – Abbruch der Schleife.")
-            break
-        seen_fingerprints.add(fingerprint)
-
-        row = []
-        for cell in cells:
-            text = cell.text.strip()
-            if not text:
-                continue
-            row.append(text)
-            if len(row) == 3:
-                entry = {
-                    "datum": date_str,
-                    "eid": row[0],
-                    "seitentitel": row[1],
-                    "aufrufe": row[2],
-                }
-                data.append(entry)
-                row = []
-
-        try:
-            all_tables = driver.find_elements(By.CSS_SELECTOR, ".table")
-            target_table = all_tables[1]
-            next_btn = target_table.find_element(By.CSS_SELECTOR, ".pageForward")
-
-            if "disabled" in next_btn.get_attribute("class").lower():
-                print("✅ Letzte Seite erreicht.")
-                break
-
-            driver.execute_script("arguments[0].click();", next_btn)
-            wait_for_page_change(driver, fingerprint)
-            time.sleep(2)
-
-        except (StaleElementReferenceException, TimeoutException) as e:
-            print(f"⚠️ Fehler beim Blättern: {e}")
-            break
-        except NoSuchElementException:
-            print("❌ Weiter-Button fehlt – vermutlich letzte Seite.")
-            break
-        except Exception as e:
-            print(f"⚠️ Unerwarteter Fehler beim Blättern: {e}")
-            break
-
-    print(f"✅ {len(data)} Datensätze insgesamt extrahiert.")
-    return data
+    # Tabellenposition, Spalten und Nachbearbeitung stehen in TABLE_SPECS
+    return scrape_table(driver, TABLE_SPECS["landingpage"], date_str)
 
 
 # ========== Chrome Initialisierung ==========
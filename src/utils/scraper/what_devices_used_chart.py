@@ -7,51 +7,22 @@ from selenium.common.exceptions import (
     TimeoutException,
     StaleElementReferenceException,
 )
-from bs4 import BeautifulSoup
 from src.utils.csv_manager_utils import CSVFileHandler
 from src.utils.calender_utils import select_date_range
+from src.utils.page_snapshot_utils import PageSnapshot
 
 # ========== Tabellendaten für "piechart gviz" extrahieren ==========
 
 
-def extract_table_for_piechart_gviz(driver, date_str):
+def extract_table_for_piechart_gviz(driver, date_str, snapshot=None):
     """
     Extrahiert die Tabelle des ersten Diagramms mit class "piechart gviz".
     Gibt Liste von Dicts zurück: [{"Datum", "Kategorie", "Wert"}, ...]
+    Mit `snapshot` wird der gemeinsame PageSnapshot des Datums genutzt.
     """
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    components = soup.find_all("ng2-piechart-component", class_="piechart gviz")
-    if not components:
-        print("❌ Keine Komponente mit class 'piechart gviz' gefunden.")
-        return []
-
-    # Falls mehrere, nimm das erste (bzw. Index anpassen!)
-    comp = components[0]
-    table_div = comp.find(
-        "div", attrs={"aria-label": lambda x: x and "tabellarische Darstellung" in x}
-    )
-    if table_div is None:
-        print("❌ Keine Tabelle im Diagramm gefunden.")
-        return []
-
-    table = table_div.find("table")
-    if table is None:
-        print("❌ Keine <table> gefunden.")
-        return []
-
-    # Zeilen extrahieren (ab Zeile 1, weil Zeile 0 der Header ist)
-    data = []
-    for tr in table.find_all("tr")[1:]:
-        tds = tr.find_all("td")
-        if len(tds) < 2:
-            continue
-        data.append(
-            {
-                "datum": date_str,
-                "kategorie": tds[0].text.strip(),
-                "wert": tds[1].text.strip(),
-            }
-        )
+    if snapshot is None:
+        snapshot = PageSnapshot(driver)
+    data = snapshot.piechart_rows("piechart gviz", 0, date_str)
     print(f"✅ {len(data)} Zeilen aus What_Devices_Used-Chart extrahiert.")
     return data
 
@@ -1,15 +1,9 @@
 import time
 from datetime import date, timedelta
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    TimeoutException,
-    StaleElementReferenceException,
-)
 from src.utils.csv_manager_utils import CSVFileHandler
+from src.utils.table_engine_utils import TABLE_SPECS, scrape_table
 from src.utils.calender_utils import select_date_range
 
 
@@ -17,153 +11,8 @@ from src.utils.calender_utils import select_date_range
 
 
 def extract_table_data(driver, date_str: str):
-    wait = WebDriverWait(driver, 10)
-    data = []
-    seen_fingerprints = set()
-
-    def get_tables():
-        # Versuche mehrfach, Tabellen stabil zu holen
-        for _ in range(5):
-            try:
-                tables = driver.find_elements(By.CSS_SELECTOR, ".table")
-                if len(tables) < 4:
-                    raise Exception("❌ Erwartete Tabelle (Index 3) nicht gefunden.")
-                return tables
-            except StaleElementReferenceException:
-                time.sleep(5)
-        raise Exception("❌ Tabellen konnten nicht stabil geladen werden.")
-
-    def get_cells():
-        # Nutzt get_tables für stabilen Zugriff
-        tables = get_tables()
-        last_table = tables[3]
-        for _ in range(5):
-            try:
-                cells = last_table.find_elements(By.CSS_SELECTOR, "div.cell")
-                return cells
-            except StaleElementReferenceException:
-                time.sleep(5)
-                tables = get_tables()  # nochmal komplette Tabellen neu holen
-                last_table = tables[3]
-        raise Exception("❌ Zellen konnten nicht stabil geladen werden.")
-
-    def get_fingerprint(cells):
-        # Fingerprint zur Seitenerkennung (erst 10 Zellen)
-        return tuple(cell.text.strip() for cell in cells[:10])
-
-    def wait_for_page_change(driver, old_fingerprint, timeout=10):
-        wait = WebDriverWait(driver, timeout)
-
-        def changed(d):
-            try:
-                new_cells = get_cells()
-                if len(new_cells) < 10:
-                    return False
-                return get_fingerprint(new_cells) != old_fingerprint
-            except StaleElementReferenceException:
-                return False
-
-        wait.until(changed)
-
-    while True:
-        try:
-            cells = get_cells()
-        except Exception as e:
-            print(f"❌ Fehler beim Lesen der Zellen: {e}")
-            break
-
-        print(f"📦 {len(cells)} Zellen erkannt (Seite).")
-
-        fingerprint = get_fingerprint(cells)
-        if fingerprint in seen_fingerprints:
-            print("🔁 Wiederholte Seite erkannt – Abbruch der Schleife.")
-            break
-        seen_fingerprints.add(fingerprint)
-
-        row = []
-        for i in range(len(cells)):
-            # Hole Zellen-Text in robustem try-except mit Neuversuchen
-            for attempt in range(5):
-                try:
-                    current_cells = get_cells()
-                    text = current_cells[i].text.strip()
-                    break
-                except StaleElementReferenceException:
-                    time.sleep(5)
-                    if attempt == 4:
-                        print(
-                            "❌ StaleElementReferenceException: Zelle konnte nicht stabil gelesen werden."
-                        )
-                        text = ""
-            if not text:
-                continue
-            row.append(text)
-            if len(row) == 5:
-                entry = {
-                    "datum": date_str,
-                    "eid": row[0],
-                    "quelle": row[1],
-                    "sitzungen": row[2],
-                    "aufrufe": row[3],
-                    "aufrufe pro sitzung": row[4].replace(".", "").replace(",", "."),
-                }
-                data.append(entry)
-                row = []
-
-        # Robust zum Weiter-Button und Seitenwechsel:
-        try:
-            tables = get_tables()
-            target_table = tables[3]
-
-            # Button mehrfach versuchen zu holen und klicken
-            next_btn = None
-            for _ in range(5):
-                try:
-                    next_btn = target_table.find_element(
-                        By.CSS_SELECTOR, ".pageForward"
-                    )
-                    break
-                except StaleElementReferenceException:
-                    time.sleep(5)
-                    tables = get_tables()
-                    target_table = tables[3]
-
-            if next_btn is None:
-                print("❌ Weiter-Button nicht gefunden, Ende der Seiten.")
-                break
-
-            if "disabled" in next_btn.get_attribute("class").lower():
-                print("✅ Letzte Seite erreicht.")
-                break
-
-            # Klick robust per execute_script mit Wiederholung
-            for _ in range(3):
-                try:
-                    driver.execute_script("arguments[0].click();", next_btn)
-                    break
-                except StaleElementReferenceException:
-                    time.sleep(5)
-                    tables = get_tables()
-                    target_table = tables[3]
-                    next_btn = target_table.find_element(
-                        By.CSS_SELECTOR, ".pageForward"
-                    )
-
-            wait_for_page_change(driver, fingerprint)
-            time.sleep(5)
-
-        except TimeoutException:
-            print("⚠️ Timeout beim Seitenwechsel: Inhalt unverändert.")
-            break
-        except (NoSuchElementException, StaleElementReferenceException) as e:
-            print(f"❌ Weiter-Button-Fehler – wahrscheinlich letzte Seite: {e}")
-            break
-        except Exception as e:
-            print(f"⚠️ Fehler beim Blättern: {e}")
-            break
-
-    print(f"✅ {len(data)} Datensätze insgesamt extrahiert.")
-    return data
+    # Tabellenposition, Spalten und Nachbearbeitung stehen in TABLE_SPECS
+    return scrape_table(driver, TABLE_SPECS["where_did_they_come_from"], date_str)
 
 
 # ========== Chrome Initialisierung ==========
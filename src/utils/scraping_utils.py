@@ -1,137 +1,581 @@
+import json
 import os
+import queue
 import time
-from datetime import timedelta
-from src.utils.log_utils import log, show_log, is_date_scraped, log_scraped_date
-from src.utils.chrome_utils import init_driver_with_cookies
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.log_utils import log, show_log, log_scraped_date, missing_dates
 from src.utils.calender_utils import select_date_range
+from src.utils.checkpoint_utils import CheckpointStore
 from src.utils.csv_manager_utils import CSVFileHandler
+from src.utils.sqlite_store_utils import get_store
+from src.utils.driver_pool_utils import get_driver_pool
 from src.utils.csv_cleaning_utils import prepare_data_paths, copy_and_validate_csvs
+from src.utils.export_utils import EXPORT_TABLES, export_rows
 from src.utils.file_utils import get_output_folder
-from src.utils.scraper.landingpage_scraper import extract_table_data as extract_landingpage_data
+from src.utils.page_snapshot_utils import PageSnapshot
+from src.utils.replay_utils import FIXTURE_DIR, RecordingDriver
+from src.utils.timing_utils import collected_spans, reset_timings, span, summarize_timings, write_timings
+from src.utils.readiness_utils import (
+    dashboard_state,
+    day_has_no_data,
+    reset_resource_timings,
+    wait_for_dashboard_ready,
+    widget_fingerprint,
+)
+from src.utils.network_capture_utils import (
+    WIDGET_COMPONENTS,
+    capture_data_responses,
+    clear_performance_log,
+    date_columns,
+    date_split_widgets,
+    describe_captured_components,
+    match_components,
+    network_widgets,
+    rows_for_widget,
+    split_rows_by_date,
+)
+from src.utils.table_engine_utils import TABLE_SPECS, scrape_table
 from src.utils.scraper.user_behaviors_scraper import extract_user_behaviour
-from src.utils.scraper.what_did_users_do_scraper import extract_table_data as extract_events_data
-from src.utils.scraper.where_did_they_come_from_scraper import extract_table_data as extract_sources_data
 from src.utils.scraper.where_new_visitors_come_from_chart import extract_table_for_piechart_gviz as extract_pie_sources
 from src.utils.scraper.what_devices_used_chart import extract_table_for_piechart_gviz as extract_pie_devices
 from src.utils.scraper.who_was_visiting_chart import extract_table_for_piechart_gviz as extract_pie_visitors
 
 
 
-def run_all_scraper(start_date, end_date, log_container=None):
-    output_folder = get_output_folder("raw")
-    driver = init_driver_with_cookies()
-    current = start_date
-    new_data = False
-    while current <= end_date:
-        if is_date_scraped(current):
-            log(f"📅 {current.isoformat()} Daten bereits extrahiert – gehe zum nächsten Datum.", "info")
-            if log_container:
-                show_log(log_container)
-            current += timedelta(days=1)
-            continue
+PIE_EXTRACTORS = [
+    ("where_new_visitors_come_from_chart", extract_pie_sources),
+    ("what_devices_used_chart", extract_pie_devices),
+    ("who_was_visiting_chart", extract_pie_visitors),
+]
 
-        log(f"\n📆 Scraping für {current.isoformat()}", "info")
-        if log_container:
-            show_log(log_container)
-        try:
-            select_date_range(driver, current, current)
-            time.sleep(8)
+# Alle Widgets in der Reihenfolge, in der scrape_day sie abarbeitet
+WIDGET_NAMES = [*TABLE_SPECS, "user_behaviors", *(label for label, _ in PIE_EXTRACTORS)]
 
-            data = extract_landingpage_data(driver, current.isoformat())
-            lp_csv = CSVFileHandler(
-                os.path.join(output_folder, f"landingpage.csv"),
-                headers=["datum", "eid", "seitentitel", "aufrufe"],
-            )
-            for row in data:
-                lp_csv.append_row(row)
-
-            row = extract_user_behaviour(driver, current)
-            if row:
-                ub_csv = CSVFileHandler(
-                    os.path.join(output_folder, f"user_behaviors.csv"),
-                    headers=[
-                        "datum",
-                        "seitenaufrufe",
-                        "nutzer insgesamt",
-                        "durchschn. zeit auf der seite",
-                        "absprungrate",
-                        "seiten / sitzung",
-                    ],
-                )
-                ub_csv.append_row(row)
-
-            data = extract_events_data(driver, current.isoformat())
-            ev_csv = CSVFileHandler(
-                os.path.join(output_folder, f"what_did_user_do.csv"),
-                headers=[
-                    "datum",
-                    "eid",
-                    "name des events",
-                    "event_label",
-                    "aktive nutzer",
-                    "ereignisanzahl",
-                ],
+ENGINES = ["dom", "network", "export"]
+
+# Ruhe im Netz (Sekunden), nach der ein Tag nach einem leeren Vortag als
+# geladen gilt – der Fingerprint ändert sich zwischen zwei leeren Tagen nicht
+EMPTY_RUN_QUIET = 1.5
+
+
+def available_engines() -> list:
+    """
+    Scraping-Modi für App und CLI. "network" erscheint erst, wenn in
+    WIDGET_COMPONENTS mindestens eine Komponenten-ID eingetragen ist –
+    sonst liefe jedes Widget ohnehin über den DOM-Scraper.
+    """
+    return [engine for engine in ENGINES if engine != "network" or network_widgets()]
+
+
+def build_raw_handlers(output_folder, store=None):
+    """
+    Legt die CSV-Handler aller Rohdateien an (einmal pro Lauf, von allen
+    Workern gemeinsam genutzt). Mit `store` schreiben sie in SQLite, die
+    CSV-Dateien entstehen danach über export().
+    """
+    return {
+        **{
+            widget: CSVFileHandler(
+                os.path.join(output_folder, f"{widget}.csv"),
+                headers=["datum", *spec.columns],
+                store=store,
             )
-            for row in data:
-                ev_csv.append_row(row)
-
-            data = extract_sources_data(driver, current.isoformat())
-            src_csv = CSVFileHandler(
-                os.path.join(output_folder, f"where_did_they_come_from.csv"),
-                headers=[
-                    "datum",
-                    "eid",
-                    "quelle",
-                    "sitzungen",
-                    "aufrufe",
-                    "aufrufe pro sitzung",
-                ],
+            for widget, spec in TABLE_SPECS.items()
+        },
+        "user_behaviors": CSVFileHandler(
+            os.path.join(output_folder, f"user_behaviors.csv"),
+            headers=[
+                "datum",
+                "seitenaufrufe",
+                "nutzer insgesamt",
+                "durchschn. zeit auf der seite",
+                "absprungrate",
+                "seiten / sitzung",
+            ],
+            store=store,
+        ),
+        **{
+            label: CSVFileHandler(
+                os.path.join(output_folder, f"{label}.csv"),
+                headers=["datum", "kategorie", "wert"],
+                store=store,
             )
-            for row in data:
-                src_csv.append_row(row)
-
-            for label, func in zip(
-                [
-                    "where_new_visitors_come_from_chart",
-                    "what_devices_used_chart",
-                    "who_was_visiting_chart",
-                ],
-                [extract_pie_sources, extract_pie_devices, extract_pie_visitors],
-            ):
-                pie_data = func(driver, current.isoformat())
-                pie_csv = CSVFileHandler(
-                    os.path.join(output_folder, f"{label}.csv"),
-                    headers=["datum", "kategorie", "wert"],
-                )
-                for row in pie_data:
-                    pie_csv.append_row(row)
+            for label, _ in PIE_EXTRACTORS
+        },
+    }
+
+
+def scrape_day(driver, current, handlers, engine="dom", checkpoints=None, done=(), only=None):
+    """
+    Scrapt alle Widgets für einen Tag und schreibt die Zeilen in die Rohdateien.
+    Mit engine="network" kommen die Tabellen aus den mitgeschnittenen
+    Datenantworten; Widgets ohne Mitschnitt fallen auf den DOM-Scraper zurück.
+    Mit engine="export" werden die Tabellen über "Daten exportieren" als CSV
+    geladen; schlägt der Export fehl, wird ebenfalls geblättert.
+    Mit einem CheckpointStore werden bereits gespeicherte Widgets übersprungen
+    und jedes fertige Widget vermerkt; `done` enthält Widgets, die schon über
+    den Zeitraum-Modus geschrieben wurden; `only` beschränkt den Tag auf
+    einzelne Widgets. Schlägt ein Widget fehl, laufen die
+    übrigen weiter; am Ende wird ein Fehler mit allen Ausfällen geworfen.
+    Meldet der Bericht nach der Datumswahl "Keine Daten", werden alle
+    Widgets übersprungen und der Tag als leer vermerkt; dann ist die
+    Rückgabe True. Lief das Warten in die Zeitüberschreitung, wird der
+    Schnelltest erst nach einer zweiten Wartephase geglaubt.
+    """
+    date_str = current.isoformat()
+
+    def table_rows(spec):
+        widget = spec.widget
+        rows = rows_for_widget(tables, widget, date_str) if tables is not None else None
+        if rows is None and engine == "export" and widget in EXPORT_TABLES:
+            try:
+                rows = export_rows(driver, widget, date_str)
+            except Exception as e:
+                print(f"⚠️ Export für {widget} fehlgeschlagen, lese Tabelle: {e}")
+        return rows if rows is not None else scrape_table(driver, spec, date_str)
+
+    snapshot = None
+
+    def pie_rows(func):
+        # Ein page_source/lxml-Parse für alle Kreisdiagramme des Tages
+        nonlocal snapshot
+        if snapshot is None:
+            snapshot = PageSnapshot(driver)
+        return func(driver, date_str, snapshot=snapshot)
+
+    def user_behaviour_rows():
+        row = extract_user_behaviour(driver, current)
+        return [row] if row else []
+
+    widgets = [
+        *((widget, lambda spec=spec: table_rows(spec)) for widget, spec in TABLE_SPECS.items()),
+        ("user_behaviors", user_behaviour_rows),
+        *((label, lambda func=func: pie_rows(func)) for label, func in PIE_EXTRACTORS),
+    ]
+    if checkpoints is not None:
+        pending = set(checkpoints.pending(current, [name for name, _ in widgets]))
+        widgets = [(name, fetch) for name, fetch in widgets if name in pending]
+    widgets = [
+        (name, fetch) for name, fetch in widgets
+        if name not in done and (only is None or name in only)
+    ]
+    if not widgets:
+        return False
 
+    if engine == "network":
+        clear_performance_log(driver)
+
+    before = dashboard_state(driver)
+    reset_resource_timings(driver)
+    with span("select_date_range"):
+        select_date_range(driver, current, current)
+    with span("wait_ready"):
+        if before.get("noData"):
+            # Vortag leer: ist dieser Tag es auch, ändert sich der Fingerprint
+            # nicht – statt in die Zeitüberschreitung zu laufen, auf längere
+            # Ruhe im Netz nach der Datumswahl warten
+            ready = wait_for_dashboard_ready(driver, None, timeout=8, quiet=EMPTY_RUN_QUIET)
+        else:
+            ready = wait_for_dashboard_ready(driver, before.get("fingerprint", ""), timeout=8)
+
+    with span("empty_probe"):
+        empty = day_has_no_data(driver)
+        if empty and not ready:
+            # Zeitüberschreitung: "Keine Daten" kann noch der alte Stand sein.
+            # Nochmals ohne Fingerprint-Vergleich warten (Vortag evtl. auch
+            # leer) und erst dann dem Schnelltest glauben.
+            if not wait_for_dashboard_ready(driver, None, timeout=8):
+                raise RuntimeError("Dashboard nicht bereit – leerer Tag nicht bestätigt")
+            empty = day_has_no_data(driver)
+    if empty:
+        if checkpoints is not None:
+            checkpoints.mark_empty(current)
+        return True
+
+    tables = None
+    if engine == "network":
+        with span("network_capture"):
+            tables = capture_data_responses(driver, WIDGET_COMPONENTS.values())
+
+    failed = []
+    for name, fetch in widgets:
+        try:
+            with span("widget", widget=name):
+                with span("extract"):
+                    rows = fetch()
+                handlers[name].append_rows(rows)
+            if isinstance(driver, RecordingDriver):
+                driver.record_rows(name, rows)
         except Exception as e:
-            log(f"❌ Fehler am {current}: {e}", "error")
-            if log_container:
-                show_log(log_container)
+            failed.append(f"{name}: {e}")
+            continue
+        if checkpoints is not None:
+            checkpoints.mark_done(current, name)
+
+    if failed:
+        raise RuntimeError("Widgets fehlgeschlagen – " + "; ".join(failed))
+    return False
+
+
+def scrape_range(driver, days, handlers, checkpoints=None, only=None):
+    """
+    Wählt mehrere aufeinanderfolgende Tage auf einmal aus und teilt die
+    Antworten der Widgets mit Datums-Dimension (WIDGET_DATE_COLUMNS) wieder in
+    Tageszeilen auf. Ein Neuaufbau des Dashboards statt einem pro Tag.
+    Gibt {tag: {widget, ...}} mit den dabei geschriebenen Widgets zurück.
+    """
+    widgets = [w for w in date_split_widgets() if only is None or w in only]
+    if checkpoints is not None:
+        widgets = [w for w in widgets if any(not checkpoints.is_done(day, w) for day in days)]
+    if not widgets:
+        return {}
+
+    clear_performance_log(driver)
+    previous = widget_fingerprint(driver)
+    reset_resource_timings(driver)
+    with span("select_date_range"):
+        select_date_range(driver, days[0], days[-1])
+    with span("wait_ready"):
+        wait_for_dashboard_ready(driver, previous, timeout=8)
+    with span("network_capture"):
+        tables = capture_data_responses(driver, [WIDGET_COMPONENTS[w] for w in widgets])
+
+    written = {day: set() for day in days}
+    for widget in widgets:
+        per_day = split_rows_by_date(tables, widget, days)
+        if per_day is None:
+            print(f"⚠️ Keine Zeitraum-Antwort für {widget} – wird pro Tag geladen.")
+            continue
+        for day, rows in per_day.items():
+            if checkpoints is None or not checkpoints.is_done(day, widget):
+                handlers[widget].append_rows(rows)
+                if checkpoints is not None:
+                    checkpoints.mark_done(day, widget)
+            written[day].add(widget)
+    return written
+
+
+def date_blocks(dates, size):
+    """
+    Fasst die (sortierten) Tage zu Blöcken aus höchstens `size`
+    lückenlos aufeinanderfolgenden Tagen zusammen.
+    """
+    blocks = []
+    for current in dates:
+        block = blocks[-1] if blocks else None
+        if block and len(block) < size and (current - block[-1]).days == 1:
+            block.append(current)
         else:
+            blocks.append([current])
+    return blocks
+
+
+def split_dates(dates, parts):
+    """
+    Teilt die (sortierte) Liste fehlender Tage in bis zu `parts`
+    zusammenhängende Blöcke auf, damit jeder Browser benachbarte Tage abarbeitet.
+    """
+    if not dates:
+        return []
+    parts = max(1, min(parts, len(dates)))
+    size, rest = divmod(len(dates), parts)
+    chunks = []
+    start = 0
+    for i in range(parts):
+        length = size + (1 if i < rest else 0)
+        chunks.append(dates[start:start + length])
+        start += length
+    return chunks
+
+
+def scrape_dates(driver, dates, handlers, report, engine="dom", checkpoints=None, range_days=1,
+                 widgets=None, outcome=None):
+    """
+    Arbeitet die übergebenen Tage nacheinander mit einem Browser ab.
+    `report(message, level)` nimmt die Log-Meldungen entgegen.
+    Mit range_days > 1 und engine="network" werden Widgets mit
+    Datums-Dimension blockweise über scrape_range geladen; die übrigen
+    Widgets werden weiter pro Tag ausgewählt.
+    Ist der Treiber ein RecordingDriver, wird jeder erfolgreiche Tag als
+    Replay-Fixture gespeichert.
+    Mit `widgets` werden nur diese Widgets gescrapt; ins Scrape-Log kommt ein
+    Tag dann erst, wenn laut Checkpoints alle Widgets vorliegen.
+    In `outcome` ({"scraped": [], "empty": [], "partial": [], "failed": []})
+    wird jeder Tag einsortiert.
+    Gibt zurück, ob neue Daten geschrieben wurden.
+    """
+    if outcome is None:
+        outcome = {"scraped": [], "empty": [], "partial": [], "failed": []}
+    recording = isinstance(driver, RecordingDriver)
+    new_data = False
+    for block in date_blocks(dates, range_days if engine == "network" else 1):
+        written = {}
+        if len(block) > 1:
+            report(f"\n📆 Zeitraum {block[0].isoformat()} bis {block[-1].isoformat()}", "info")
+            try:
+                with span("range", start=block[0].isoformat(), days=len(block)):
+                    written = scrape_range(driver, block, handlers, checkpoints, widgets)
+            except Exception as e:
+                report(f"⚠️ Zeitraum-Abfrage fehlgeschlagen, lade Tag für Tag: {e}", "warning")
+
+        for current in block:
+            report(f"\n📆 Scraping für {current.isoformat()}", "info")
+            if recording:
+                driver.reset()
+            try:
+                with span("day", date=current.isoformat()):
+                    empty = scrape_day(
+                        driver, current, handlers, engine, checkpoints, written.get(current, ()), widgets
+                    )
+            except Exception as e:
+                outcome["failed"].append(current.isoformat())
+                report(f"❌ Fehler am {current}: {e}", "error")
+                continue
+
+            if recording:
+                driver.save(current)
+            complete = empty or widgets is None or (
+                checkpoints is not None and not checkpoints.pending(current, WIDGET_NAMES)
+            )
+            if not empty:
+                new_data = True
+            if not complete:
+                outcome["partial"].append(current.isoformat())
+                report(f"☑️ {current.isoformat()}: gewählte Widgets gespeichert.", "success")
+                continue
             log_scraped_date(current)
-            new_data = True
-            log(f"✅ {current.isoformat()} geloggt.", "success")
+            if empty:
+                outcome["empty"].append(current.isoformat())
+                report(f"🛑 {current.isoformat()}: Keine Daten (Feiertag o. ä.) – als leer geloggt.", "info")
+            else:
+                outcome["scraped"].append(current.isoformat())
+                report(f"✅ {current.isoformat()} geloggt.", "success")
+    return new_data
+
+
+def _run_parallel(driver, chunks, handlers, log_container=None, engine="dom", checkpoints=None, record=False,
+                  headless=True, **options):
+    """
+    Verteilt die Tagesblöcke auf eigene Browser-Threads. Der erste Block
+    nutzt den bereits angemeldeten Treiber, die übrigen holen ihren eigenen
+    aus dem Browser-Pool (mit einer Kopie des Chrome-Profils). Log-Meldungen
+    laufen über eine Queue, weil nur der Streamlit-Thread in die Session
+    schreiben darf. `options` gehen unverändert an scrape_dates.
+    """
+    messages = queue.Queue()
+
+    def report(message, level="info"):
+        messages.put((message, level))
+
+    drivers = get_driver_pool()
+
+    def worker(index, chunk):
+        if index == 0:
+            base_driver = driver
+        else:
+            with span("login"):
+                base_driver = drivers.acquire(index, capture_network=engine == "network", headless=headless)
+        own_driver = RecordingDriver(base_driver) if record else base_driver
+        try:
+            report(f"🧭 Browser {index + 1}: {chunk[0].isoformat()} bis {chunk[-1].isoformat()} ({len(chunk)} Tage)", "info")
+            return scrape_dates(own_driver, chunk, handlers, report, engine, checkpoints, **options)
+        finally:
+            drivers.release(base_driver)
+
+    def drain():
+        while True:
+            try:
+                message, level = messages.get_nowait()
+            except queue.Empty:
+                break
+            log(message, level)
+        if log_container:
+            show_log(log_container)
+
+    new_data = False
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        futures = [pool.submit(worker, i, chunk) for i, chunk in enumerate(chunks)]
+        while not all(f.done() for f in futures):
+            time.sleep(0.5)
+            drain()
+        for i, future in enumerate(futures):
+            try:
+                new_data = future.result() or new_data
+            except Exception as e:
+                failed = options.get("outcome", {}).get("failed")
+                if failed is not None:
+                    failed.extend(d.isoformat() for d in chunks[i])
+                report(f"❌ Browser {i + 1} abgebrochen: {e}", "error")
+    drain()
+    return new_data
+
+
+def run_all_scraper(start_date, end_date, log_container=None, workers=1, engine="dom", record=False, range_days=1,
+                    headless=True, widgets=None):
+    """
+    Scrapt alle noch fehlenden Tage im Zeitraum und bereitet danach die
+    Rohdateien auf. Gibt eine Zusammenfassung des Laufs als Dict zurück
+    (Tage je Ergebnis, ob aufbereitet wurde, teuerste Schritte).
+    """
+    output_folder = get_output_folder("raw")
+    reset_timings()
+    dates = missing_dates(start_date, end_date)
+    total_days = max((end_date - start_date).days + 1, 0)
+    outcome = {"scraped": [], "empty": [], "partial": [], "failed": []}
+    summary = {
+        "start": start_date.isoformat(),
+        "end": end_date.isoformat(),
+        "planned": len(dates),
+        "skipped": total_days - len(dates),
+    }
+    if total_days > len(dates):
+        log(f"📅 {total_days - len(dates)} von {total_days} Tagen bereits extrahiert – werden übersprungen.", "info")
+    if not dates:
+        # Nichts zu tun: ohne Browser und Anmeldung zurückkehren (cron/CLI)
+        log("✅ Keine fehlenden Tage – Browser wird nicht gestartet.", "success")
+        if log_container:
+            show_log(log_container)
+        return {**summary, **outcome, "cleaned": False, "rejected": 0, "timings": []}
+
+    if engine == "network":
+        configured = network_widgets()
+        if not configured:
+            log("⚠️ Netzwerk-Modus: keine Komponenten-IDs in WIDGET_COMPONENTS eingetragen – es wird der DOM-Modus verwendet.", "warning")
+            engine = "dom"
+        elif len(configured) < len(WIDGET_COMPONENTS):
+            fallback = [widget for widget in WIDGET_COMPONENTS if widget not in configured]
+            log(f"ℹ️ Netzwerk-Modus: ohne Komponenten-ID, per DOM gelesen: {', '.join(fallback)}", "info")
+    if range_days > 1 and not (engine == "network" and date_split_widgets()):
+        log("ℹ️ Tage pro Auswahl ohne Wirkung: kein Widget mit Datums-Dimension im Netzwerk-Modus – Tag für Tag.", "info")
+        range_days = 1
+
+    chunks = split_dates(dates, workers)
+    drivers = get_driver_pool()
+    if len(chunks) > 1:
+        drivers.prepare_profiles(len(chunks))
+    with span("login"):
+        driver = drivers.acquire(0, capture_network=engine == "network", headless=headless)
+    store = get_store()
+    handlers = build_raw_handlers(output_folder, store=store)
+    checkpoints = CheckpointStore()
+
+    log(f"🗓️ {len(dates)} Tage zu scrapen.", "info")
+    if log_container:
+        show_log(log_container)
+
+    options = {"range_days": range_days, "widgets": widgets, "outcome": outcome}
+    if len(chunks) > 1:
+        new_data = _run_parallel(driver, chunks, handlers, log_container, engine, checkpoints, record, headless, **options)
+    else:
+        def report(message, level="info"):
+            log(message, level)
             if log_container:
                 show_log(log_container)
+
+        try:
+            scrape_driver = RecordingDriver(driver) if record else driver
+            new_data = scrape_dates(scrape_driver, dates, handlers, report, engine, checkpoints, **options)
         finally:
-            current += timedelta(days=1)
+            drivers.release(driver)
 
-    driver.quit()
-    time.sleep(5)
+    if new_data:
+        # Rohdateien für Aufbereitung und Notebooks aus SQLite erzeugen
+        with span("raw_export"):
+            for handler in handlers.values():
+                handler.export()
+    # Geänderte (nicht nur neue) Zeilen: diese Dateien komplett aufbereiten
+    rebuild = {table + ".csv" for table in store.take_rewritten()}
 
     paths = prepare_data_paths()
     raw_files_exist = any(
         os.path.exists(os.path.join(paths["output_folder"], fname))
         for fname in paths["file_names"]
     )
-    if raw_files_exist and new_data:
-        copy_and_validate_csvs(paths, log=log, show_log=show_log, log_container=log_container)
+    cleaned = raw_files_exist and new_data
+    rejected = []
+    if cleaned:
+        with span("clean"):
+            rejected = copy_and_validate_csvs(
+                paths, log=log, show_log=show_log, log_container=log_container, rebuild=rebuild
+            )
         log("✅ Alle CSV-Dateien wurden erfolgreich aufbereitet.", "success")
     else:
         log("⚠️ Keine Rohdaten gefunden!\nMöglicherweise ist beim Scraping ein Fehler aufgetreten!\nOder sind diese Daten bereits extrahiert worden? 🤔",
             "warning")
+    timings = log_timing_summary(log_container)
     if log_container:
         show_log(log_container)
+
+    return {
+        **summary,
+        **{status: sorted(days) for status, days in outcome.items()},
+        "cleaned": cleaned,
+        "rejected": len(rejected),
+        "timings": timings,
+    }
+
+
+# ========== Komponenten-IDs für den Netzwerk-Modus ermitteln ==========
+#
+# Schneidet für einen Tag die Datenantworten mit, liest dieselben Tabellen
+# über den DOM-Scraper und ordnet beide einander zu. Die Aufnahme bleibt als
+# Fixture liegen (Regressionstest des Decoders, tests/test_network_capture.py).
+
+COMPONENT_FIXTURE_DIR = os.path.join(FIXTURE_DIR, "components")
+
+
+def discover_components(day, headless=True, fixture_dir: str = COMPONENT_FIXTURE_DIR) -> dict:
+    """
+    Lädt `day` mit Netzwerk-Mitschnitt, gleicht die Antworten mit den
+    DOM-Tabellen ab (match_components) und gibt einen Vorschlag für
+    WIDGET_COMPONENTS und WIDGET_DATE_COLUMNS aus. Gibt die Aufnahme zurück und speichert sie als
+    JSON in `fixture_dir`.
+    """
+    date_str = day.isoformat()
+    drivers = get_driver_pool()
+    driver = drivers.acquire(0, capture_network=True, headless=headless)
+    try:
+        clear_performance_log(driver)
+        previous = widget_fingerprint(driver)
+        reset_resource_timings(driver)
+        select_date_range(driver, day, day)
+        wait_for_dashboard_ready(driver, previous, timeout=8)
+        responses = []
+        tables = capture_data_responses(driver, responses=responses)
+        dom_rows = {widget: scrape_table(driver, spec, date_str) for widget, spec in TABLE_SPECS.items()}
+    finally:
+        drivers.release(driver)
+
+    matches = match_components(tables, dom_rows, day)
+    dates = date_columns(tables, matches, day)
+    describe_captured_components(tables, matches, dates)
+    capture = {
+        "date": date_str, "responses": responses, "dom_rows": dom_rows,
+        "matches": matches, "date_columns": dates,
+    }
+    os.makedirs(fixture_dir, exist_ok=True)
+    path = os.path.join(fixture_dir, f"{date_str}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(capture, f, ensure_ascii=False)
+    log(f"💾 Mitschnitt gespeichert: {path}", "info")
+    return capture
+
+
+def log_timing_summary(log_container=None, top: int = 8):
+    """
+    Schreibt die Spans des Laufs in die Timings-Datei und zeigt die
+    teuersten Schritte im Log-Fenster. Gibt diese Schritte zurück.
+    """
+    spans = collected_spans()
+    if not spans:
+        return []
+    write_timings(spans)
+    summary = summarize_timings(spans)[:top]
+    log("⏱️ Zeitverteilung dieses Laufs:", "info")
+    for entry in summary:
+        log(
+            f"⏱️ {entry['stage']}: {entry['total']:.1f} s gesamt "
+            f"({entry['count']}×, Ø {entry['mean']:.2f} s, max {entry['max']:.2f} s)",
+            "info",
+        )
+    return summary
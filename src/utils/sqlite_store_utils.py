@@ -0,0 +1,337 @@
+import csv
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from src.utils.csv_manager_utils import _file_stamp
+from src.utils.timing_utils import span
+
+
+# ========== Rohdaten in SQLite ==========
+#
+# Die Rohdaten liegen in einer eingebetteten SQLite-Datenbank, eine Tabelle
+# pro Rohdatei. Ein gescrapter Tag eines Widgets wird als Ganzes gespeichert:
+# in einer Transaktion werden die vorhandenen Zeilen des Tages gelöscht und
+# die neuen eingefügt – so bleiben weder Reste eines früheren, längeren
+# Scrapes noch gemischte Tage aus zwei Scrapes übrig. Die CSV-Dateien in
+# src/data/raw werden bei Bedarf aus der Datenbank erzeugt (export_csv).
+#
+# Die Rohdateien sind im Repository, die Datenbank nicht: Pro Tabelle merkt
+# sich _csv_sync Größe/mtime der Rohdatei beim letzten Import/Export. Hat sich
+# die Datei seither geändert (git pull, Handkorrektur), werden ihre Tage vor
+# dem nächsten Export übernommen (sync_from_csv) – nichts wird überschrieben.
+# Kamen seit dem Export nur neue Zeilen hinzu, werden sie angehängt, statt
+# die ganze Datei neu zu schreiben.
+
+SYNC_TABLE = "_csv_sync"
+
+DB_PATH = os.path.join("src", "data", "redezeit.sqlite")
+
+# Spalte, nach der die Zeilen eines Scrapes zusammengehören
+DAY_COLUMN = "datum"
+
+# Natürliche Schlüssel je Rohdatei (Index für row_exists und die Prüfung auf
+# doppelte Zeilen beim Import); Tabellen ohne Eintrag nutzen alle Spalten.
+NATURAL_KEYS = {
+    "landingpage": ["datum", "eid"],
+    "what_did_user_do": ["datum", "eid"],
+    "where_did_they_come_from": ["datum", "eid"],
+    "user_behaviors": ["datum"],
+    "what_devices_used_chart": ["datum", "kategorie"],
+    "where_new_visitors_come_from_chart": ["datum", "kategorie"],
+    "who_was_visiting_chart": ["datum", "kategorie"],
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteStore:
+    def __init__(self, db_path: str = DB_PATH):
+        """
+        db_path — Datei der Datenbank (wird bei Bedarf angelegt)
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Eine Verbindung für alle Scraper-Threads, serialisiert über den Lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.RLock()
+        self._columns: Dict[str, List[str]] = {}
+        self._rewritten: Set[str] = set()
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {SYNC_TABLE} ("
+            "tbl TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "exported_rowid INTEGER NOT NULL DEFAULT 0, full_export INTEGER NOT NULL DEFAULT 1)"
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def key_columns(self, table: str, columns: List[str]) -> List[str]:
+        return NATURAL_KEYS.get(table) or list(columns)
+
+    def ensure_table(self, table: str, columns: List[str], csv_path: str = None, delimiter: str = ";") -> None:
+        """
+        Legt die Tabelle an und gleicht sie mit der Rohdatei ab (sync_from_csv):
+        eine leere Tabelle übernimmt die Datei unverändert, eine seit dem
+        letzten Export geänderte Datei wird tageweise übernommen.
+        """
+        key = self.key_columns(table, columns)
+        column_sql = ", ".join(f"{_quote(c)} TEXT NOT NULL DEFAULT ''" for c in columns)
+        key_sql = ", ".join(_quote(c) for c in key)
+        with self._lock:
+            # Ältere Datenbanken hatten einen Primärschlüssel, der doppelte
+            # Zeilen beim Import überschrieben hat: aus der Rohdatei neu aufbauen
+            info = self._conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+            if any(column[5] for column in info):
+                print(f"🔁 Tabelle {table} mit altem Primärschlüssel – wird aus der Rohdatei neu aufgebaut.")
+                self._conn.execute(f"DROP TABLE {_quote(table)}")
+                self._conn.execute(f"DELETE FROM {SYNC_TABLE} WHERE tbl = ?", (table,))
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({column_sql})")
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(table + '_key')} ON {_quote(table)} ({key_sql})"
+            )
+            if DAY_COLUMN in columns and DAY_COLUMN not in key:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(table + '_day')} ON {_quote(table)} ({_quote(DAY_COLUMN)})"
+                )
+            self._conn.commit()
+            self._columns[table] = list(columns)
+
+        if csv_path:
+            self.sync_from_csv(table, csv_path, delimiter=delimiter)
+
+    def _sync_state(self, table: str):
+        """(size, mtime_ns, exported_rowid, full_export) der Tabelle oder None."""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT size, mtime_ns, exported_rowid, full_export FROM {SYNC_TABLE} WHERE tbl = ?", (table,)
+            ).fetchone()
+
+    def _mark_synced(self, table: str, csv_path: str, full_export: bool = False) -> None:
+        # Stand der Rohdatei und letzte exportierte Zeile merken
+        size, mtime_ns = _file_stamp(csv_path) or (None, None)
+        with self._lock, self._conn:
+            last = self._conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {_quote(table)}").fetchone()[0]
+            self._conn.execute(
+                f"INSERT INTO {SYNC_TABLE} (tbl, size, mtime_ns, exported_rowid, full_export) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(tbl) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, "
+                "exported_rowid = excluded.exported_rowid, full_export = excluded.full_export",
+                (table, size, mtime_ns, last, int(full_export)),
+            )
+
+    def _mark_full_export(self, table: str) -> None:
+        # Aufruf innerhalb der Transaktion, die vorhandene Zeilen ersetzt
+        self._conn.execute(
+            f"INSERT INTO {SYNC_TABLE} (tbl, full_export) VALUES (?, 1) "
+            "ON CONFLICT(tbl) DO UPDATE SET full_export = 1",
+            (table,),
+        )
+
+    def sync_from_csv(self, table: str, csv_path: str, delimiter: str = ";") -> int:
+        """
+        Übernimmt die Rohdatei, wenn sie sich seit dem letzten Import/Export
+        geändert hat (Größe oder mtime). Eine leere Tabelle übernimmt sie
+        unverändert; sonst ersetzen die Tage der Datei die Tage der Tabelle
+        (replace_days), Tage nur in der Tabelle bleiben erhalten. Danach wird
+        beim nächsten Export die ganze Datei neu geschrieben.
+        Gibt die Zahl der übernommenen Zeilen zurück.
+        """
+        stamp = _file_stamp(csv_path)
+        state = self._sync_state(table)
+        if stamp is None:
+            return 0
+        if state is not None and tuple(state[:2]) == stamp and self.count_rows(table) > 0:
+            return 0
+
+        with span("sqlite_import", table=table), open(csv_path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            next(reader, None)
+            rows = [row for row in reader if row]
+        name = os.path.basename(csv_path)
+        with self._lock:
+            if self.count_rows(table) == 0:
+                written = self.insert_rows(table, rows)
+                print(f"📥 {self.count_rows(table)} Zeilen aus {name} in SQLite übernommen.")
+                self._mark_synced(table, csv_path)
+                self.report_duplicates(table)
+                return written
+
+            written = self.replace_days(table, rows)
+            # Tage nur in der Datenbank fehlen der Datei: dann ebenfalls neu schreiben
+            full_export = written > 0 or self.count_rows(table) != len(rows)
+            if written:
+                print(f"🔁 {name} wurde außerhalb geändert – {written} Zeilen in SQLite übernommen.")
+            self._mark_synced(table, csv_path, full_export=full_export)
+        return written
+
+    def _values(self, table: str, row: Union[List, Dict]) -> Tuple[str, ...]:
+        columns = self._columns[table]
+        if isinstance(row, dict):
+            row = [row.get(c) for c in columns]
+        values = ['' if value is None else str(value) for value in row]
+        values += [''] * (len(columns) - len(values))
+        return tuple(values[:len(columns)])
+
+    def _insert_sql(self, table: str) -> str:
+        columns = self._columns[table]
+        column_sql = ", ".join(_quote(c) for c in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        return f"INSERT INTO {_quote(table)} ({column_sql}) VALUES ({placeholders})"
+
+    def count_rows(self, table: str) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}").fetchone()[0]
+
+    def insert_rows(self, table: str, rows: Iterable[Union[List, Dict]]) -> int:
+        """Fügt die Zeilen unverändert in einer Transaktion an. Gibt ihre Zahl zurück."""
+        values = [self._values(table, row) for row in rows]
+        if not values:
+            return 0
+        with span("sqlite_insert", table=table), self._lock:
+            with self._conn:
+                self._conn.executemany(self._insert_sql(table), values)
+        return len(values)
+
+    def replace_days(self, table: str, rows: Iterable[Union[List, Dict]]) -> int:
+        """
+        Speichert die Zeilen als vollständigen Scrape ihrer Tage: Für jeden
+        enthaltenen Tag werden die vorhandenen Zeilen in derselben Transaktion
+        gelöscht und durch die neuen ersetzt. Tage, deren Zeilen sich nicht
+        geändert haben, bleiben unangetastet.
+        Gibt die Zahl der neu geschriebenen Zeilen zurück.
+        """
+        columns = self._columns[table]
+        if DAY_COLUMN not in columns:
+            return self.insert_rows(table, rows)
+        day_index = columns.index(DAY_COLUMN)
+        by_day: Dict[str, List[Tuple[str, ...]]] = {}
+        for row in rows:
+            values = self._values(table, row)
+            by_day.setdefault(values[day_index], []).append(values)
+        if not by_day:
+            return 0
+
+        column_sql = ", ".join(_quote(c) for c in columns)
+        select_sql = f"SELECT {column_sql} FROM {_quote(table)} WHERE {_quote(DAY_COLUMN)} = ? ORDER BY rowid"
+        delete_sql = f"DELETE FROM {_quote(table)} WHERE {_quote(DAY_COLUMN)} = ?"
+        written = 0
+        with span("sqlite_replace", table=table), self._lock:
+            with self._conn:
+                for day, values in by_day.items():
+                    existing = self._conn.execute(select_sql, (day,)).fetchall()
+                    if existing == values:
+                        continue
+                    if existing:
+                        # Zeilen mitten in der Tabelle ersetzt: die Rohdatei wächst nicht nur hinten
+                        self._conn.execute(delete_sql, (day,))
+                        self._mark_full_export(table)
+                        self._rewritten.add(table)
+                    self._conn.executemany(self._insert_sql(table), values)
+                    written += len(values)
+        return written
+
+    def report_duplicates(self, table: str) -> Dict[str, int]:
+        """
+        Meldet Tage mit mehrfach vorhandenem natürlichem Schlüssel (z. B. zwei
+        Scrapes desselben Tages in einer alten Rohdatei). Die Zeilen bleiben
+        unverändert; ein erneutes Scrapen des Tages ersetzt sie.
+        Gibt {tag: doppelte schlüssel} zurück.
+        """
+        columns = self._columns[table]
+        key = self.key_columns(table, columns)
+        if DAY_COLUMN not in key:
+            return {}
+        key_sql = ", ".join(_quote(c) for c in key)
+        with self._lock:
+            found = self._conn.execute(
+                f"SELECT {_quote(DAY_COLUMN)}, COUNT(*) FROM ("
+                f"SELECT {key_sql} FROM {_quote(table)} GROUP BY {key_sql} HAVING COUNT(*) > 1"
+                f") GROUP BY {_quote(DAY_COLUMN)} ORDER BY {_quote(DAY_COLUMN)}"
+            ).fetchall()
+        duplicates = dict(found)
+        if duplicates:
+            days = ", ".join(list(duplicates)[:10]) + (" …" if len(duplicates) > 10 else "")
+            print(
+                f"⚠️ {table}: doppelte Schlüssel ({', '.join(key)}) an {len(duplicates)} Tag(en): {days} – "
+                f"Zeilen unverändert übernommen, erneutes Scrapen des Tages ersetzt sie."
+            )
+        return duplicates
+
+    def take_rewritten(self) -> Set[str]:
+        """
+        Gibt die Tabellen zurück, in denen seit dem letzten Aufruf vorhandene
+        Zeilen ersetzt wurden, und setzt die Liste zurück.
+        """
+        with self._lock:
+            tables, self._rewritten = self._rewritten, set()
+        return tables
+
+    def row_exists(self, table: str, row: Union[List, Dict]) -> bool:
+        """Gibt es schon eine Zeile mit demselben Schlüssel?"""
+        columns = self._columns[table]
+        key = self.key_columns(table, columns)
+        values = dict(zip(columns, self._values(table, row)))
+        where = " AND ".join(f"{_quote(c)} = ?" for c in key)
+        with self._lock:
+            found = self._conn.execute(
+                f"SELECT 1 FROM {_quote(table)} WHERE {where} LIMIT 1", [values[c] for c in key]
+            ).fetchone()
+        return found is not None
+
+    def export_csv(self, table: str, csv_path: str, delimiter: str = ";") -> int:
+        """
+        Schreibt die Tabelle als Rohdatei (Kopfzeile, BOM, Einfügereihenfolge).
+        Eine seit dem letzten Export geänderte Datei wird vorher übernommen
+        (sync_from_csv). Kamen seitdem nur Zeilen hinzu, werden diese
+        angehängt; sonst wird die Datei neu geschrieben und erst ersetzt,
+        wenn alles geschrieben ist. Gibt die Zahl der geschriebenen Zeilen zurück.
+        """
+        columns = self._columns[table]
+        column_sql = ", ".join(_quote(c) for c in columns)
+        with span("sqlite_export", table=table), self._lock:
+            self.sync_from_csv(table, csv_path, delimiter=delimiter)
+            state = self._sync_state(table)
+            if state is not None and not state[3] and tuple(state[:2]) == _file_stamp(csv_path):
+                cursor = self._conn.execute(
+                    f"SELECT {column_sql} FROM {_quote(table)} WHERE rowid > ? ORDER BY rowid", (state[2],)
+                )
+                count = 0
+                with open(csv_path, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
+                    for row in cursor:
+                        writer.writerow(row)
+                        count += 1
+            else:
+                cursor = self._conn.execute(f"SELECT {column_sql} FROM {_quote(table)} ORDER BY rowid")
+                tmp_path = csv_path + ".tmp"
+                count = 0
+                with open(tmp_path, "w", newline="", encoding="utf-8-sig") as f:
+                    writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
+                    writer.writerow(columns)
+                    for row in cursor:
+                        writer.writerow(row)
+                        count += 1
+                os.replace(tmp_path, csv_path)
+            self._mark_synced(table, csv_path)
+        return count
+
+
+_STORES: Dict[str, SQLiteStore] = {}
+_STORES_GUARD = threading.Lock()
+
+
+def get_store(db_path: str = DB_PATH) -> SQLiteStore:
+    """Eine SQLiteStore-Instanz pro Datenbankdatei und Prozess."""
+    key = os.path.normcase(os.path.abspath(db_path))
+    with _STORES_GUARD:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = SQLiteStore(db_path)
+        return store
@@ -0,0 +1,133 @@
+from selenium.common.exceptions import TimeoutException
+from src.utils.readiness_utils import wait_for_render_idle
+from src.utils.table_utils import (
+    click_next_page,
+    get_fingerprint,
+    group_cells,
+    read_table_page,
+    wait_for_page_change,
+)
+from src.utils.timing_utils import span
+
+
+# ========== Tabellen-Widgets deklarativ beschreiben ==========
+#
+# Alle paginierten Tabellen im Dashboard werden gleich gelesen: Seite per
+# execute_script holen, Zeilen bilden, "Weiter" klicken, auf den neuen Inhalt
+# warten. Ein Widget beschreibt nur noch, wo seine Tabelle steht, wie die
+# Spalten heißen und welche Werte nachbearbeitet werden.
+
+
+def german_decimal(value: str) -> str:
+    """Dashboard-Zahl "1.234,5" -> "1234.5" (Punkt als Dezimaltrenner)."""
+    return value.replace(".", "").replace(",", ".")
+
+
+class TableSpec:
+    def __init__(self, widget: str, table_index: int, columns: list, normalisers: dict = None,
+                 min_tables: int = None, idle_timeout: float = 2):
+        """
+        widget       — Name der Rohdatei/des Widgets
+        table_index  — Position der Tabelle unter allen ".table"-Elementen
+        columns      — Spaltennamen in Anzeigereihenfolge, beginnend mit "eid"
+        normalisers  — {spalte: funktion(text) -> text}
+        min_tables   — so viele Tabellen müssen gerendert sein (Standard: index + 1)
+        idle_timeout — höchstens so lange nach dem Blättern auf Ruhe im Netz warten
+        """
+        self.widget = widget
+        self.table_index = table_index
+        self.columns = columns
+        self.normalisers = normalisers or {}
+        self.min_tables = min_tables or table_index + 1
+        self.idle_timeout = idle_timeout
+
+    @property
+    def value_columns(self) -> list:
+        """Die Spalten ohne die laufende Nummer ("eid")."""
+        return self.columns[1:]
+
+    def build_row(self, values: list, date_str: str) -> dict:
+        row = {"datum": date_str}
+        for name, value in zip(self.columns, values):
+            row[name] = self.normalisers[name](value) if name in self.normalisers else value
+        return row
+
+
+TABLE_SPECS = {
+    spec.widget: spec
+    for spec in [
+        TableSpec(
+            "landingpage", 1, ["eid", "seitentitel", "aufrufe"],
+            min_tables=3,
+        ),
+        TableSpec(
+            "what_did_user_do", 4,
+            ["eid", "name des events", "event_label", "aktive nutzer", "ereignisanzahl"],
+            min_tables=5, idle_timeout=5,
+        ),
+        TableSpec(
+            "where_did_they_come_from", 3,
+            ["eid", "quelle", "sitzungen", "aufrufe", "aufrufe pro sitzung"],
+            normalisers={"aufrufe pro sitzung": german_decimal},
+            min_tables=4, idle_timeout=5,
+        ),
+    ]
+}
+
+
+def scrape_table(driver, spec: TableSpec, date_str: str) -> list:
+    """
+    Liest alle Seiten der Tabelle eines Widgets und gibt die Zeilen-Dicts
+    der Rohdatei zurück.
+    """
+    data = []
+    seen_fingerprints = set()
+    page_no = 0
+
+    while True:
+        page_no += 1
+        try:
+            # Ganze Seite in einem execute_script-Aufruf
+            with span("table_read", page=page_no):
+                page = read_table_page(driver, spec.table_index, min_tables=spec.min_tables)
+        except Exception as e:
+            print(f"❌ Fehler beim Lesen der Zellen: {e}")
+            break
+
+        cells = page["cells"]
+        print(f"📦 {len(cells)} Zellen erkannt (Seite).")
+
+        fingerprint = get_fingerprint(cells)
+        if fingerprint in seen_fingerprints:
+            print("🔁 Wiederholte Seite erkannt – Abbruch der Schleife.")
+            break
+        seen_fingerprints.add(fingerprint)
+
+        for values in group_cells(cells, len(spec.columns)):
+            data.append(spec.build_row(values, date_str))
+
+        if page["nextState"] == "missing":
+            print("❌ Weiter-Button fehlt – vermutlich letzte Seite.")
+            break
+        if page["nextState"] == "disabled":
+            print("✅ Letzte Seite erreicht.")
+            break
+
+        # Navigation zur nächsten Seite
+        try:
+            with span("page_flip", page=page_no):
+                if not click_next_page(driver, spec.table_index):
+                    print("✅ Letzte Seite erreicht.")
+                    break
+                wait_for_page_change(driver, spec.table_index, fingerprint)
+                wait_for_render_idle(driver, timeout=spec.idle_timeout)
+        except TimeoutException:
+            print("⚠️ Timeout beim Seitenwechsel: Inhalt unverändert.")
+            break
+        except Exception as e:
+            print(f"⚠️ Unerwarteter Fehler beim Blättern: {e}")
+            break
+
+    print(f"✅ {len(data)} Datensätze insgesamt extrahiert.")
+    return data
+
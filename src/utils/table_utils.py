@@ -0,0 +1,78 @@
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# ========== Tabellenseiten per JavaScript lesen ==========
+#
+# Eine Tabellenseite wird mit einem einzigen execute_script-Aufruf als Liste
+# von Strings geholt, statt jede Zelle einzeln über WebDriver (.text) zu lesen.
+
+_READ_TABLE_JS = """
+const tables = document.querySelectorAll('.table');
+const table = tables[arguments[0]];
+if (!table) {
+    return {tableCount: tables.length, cells: null, nextState: 'missing'};
+}
+const cells = Array.from(table.querySelectorAll('div.cell'), c => (c.innerText || '').trim());
+const next = table.querySelector('.pageForward');
+let nextState = 'missing';
+if (next) {
+    nextState = (next.getAttribute('class') || '').toLowerCase().includes('disabled') ? 'disabled' : 'enabled';
+}
+return {tableCount: tables.length, cells: cells, nextState: nextState};
+"""
+
+_CLICK_NEXT_JS = """
+const table = document.querySelectorAll('.table')[arguments[0]];
+const next = table ? table.querySelector('.pageForward') : null;
+if (!next || (next.getAttribute('class') || '').toLowerCase().includes('disabled')) {
+    return false;
+}
+next.click();
+return true;
+"""
+
+
+def read_table_page(driver, table_index: int, min_tables: int = None) -> dict:
+    """
+    Liest die aktuelle Seite der Tabelle `table_index` in einem Round-Trip.
+    Gibt {"cells": [str, ...], "nextState": "enabled" | "disabled" | "missing"} zurück.
+    """
+    min_tables = min_tables or table_index + 1
+    page = driver.execute_script(_READ_TABLE_JS, table_index)
+    if not page or page.get("tableCount", 0) < min_tables or page.get("cells") is None:
+        raise Exception(f"❌ Erwartete Tabelle (Index {table_index}) nicht gefunden.")
+    return page
+
+
+def get_fingerprint(cells: list) -> tuple:
+    """Fingerprint zur Seitenerkennung (erste 10 Zellen)."""
+    return tuple(cells[:10])
+
+
+def group_cells(cells: list, width: int) -> list:
+    """Fasst die nicht-leeren Zellen zu Zeilen mit `width` Werten zusammen."""
+    texts = [text for text in cells if text]
+    return [texts[i:i + width] for i in range(0, len(texts) - width + 1, width)]
+
+
+def click_next_page(driver, table_index: int) -> bool:
+    """Klickt auf "Weiter" der Tabelle; False, wenn es keine weitere Seite gibt."""
+    return bool(driver.execute_script(_CLICK_NEXT_JS, table_index))
+
+
+def wait_for_page_change(driver, table_index: int, old_fingerprint: tuple, timeout: float = 10) -> dict:
+    """
+    Wartet, bis die Tabelle eine neue Seite zeigt, und gibt diese zurück.
+    Wirft TimeoutException, wenn sich der Inhalt nicht ändert.
+    """
+
+    def changed(d):
+        try:
+            page = read_table_page(d, table_index)
+        except Exception:
+            return False
+        if not page["cells"]:
+            return False
+        return page if get_fingerprint(page["cells"]) != old_fingerprint else False
+
+    return WebDriverWait(driver, timeout).until(changed)
@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# ========== Zeitmessung der Scraping-Schritte ==========
+#
+# span("stage", **tags) misst einen Abschnitt. Tags wie date, widget oder
+# page werden an verschachtelte Spans vererbt (pro Thread), sodass jede
+# Messung weiß, zu welchem Tag/Widget/Seite sie gehört. Am Ende eines Laufs
+# werden die Spans als JSON-Zeilen in TIMINGS_PATH geschrieben.
+
+TIMINGS_PATH = os.path.join("src", "data", "log", "timings.jsonl")
+
+_SPANS = []
+_SPANS_LOCK = threading.Lock()
+_local = threading.local()
+
+
+@contextmanager
+def span(stage: str, **tags):
+    previous = getattr(_local, "tags", {})
+    current = dict(previous)
+    current.update({key: str(value) for key, value in tags.items()})
+    _local.tags = current
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        _local.tags = previous
+        with _SPANS_LOCK:
+            _SPANS.append({"stage": stage, "seconds": round(seconds, 4), **current})
+
+
+def reset_timings() -> None:
+    with _SPANS_LOCK:
+        _SPANS.clear()
+
+
+def collected_spans() -> list:
+    with _SPANS_LOCK:
+        return list(_SPANS)
+
+
+def write_timings(spans: list, path: str = TIMINGS_PATH, run_id: str = None) -> str:
+    """
+    Hängt die Spans eines Laufs als JSON-Zeilen an die Timings-Datei an.
+    """
+    run_id = run_id or datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(
+            json.dumps({"run": run_id, **record}, ensure_ascii=False) + "\n" for record in spans
+        )
+    return path
+
+
+def summarize_timings(spans: list) -> list:
+    """
+    Fasst die Spans pro Stage zusammen, sortiert nach Gesamtzeit:
+    [{"stage", "count", "total", "mean", "max"}, ...]
+    """
+    stages = {}
+    for record in spans:
+        entry = stages.setdefault(record["stage"], {"stage": record["stage"], "count": 0, "total": 0.0, "max": 0.0})
+        entry["count"] += 1
+        entry["total"] += record["seconds"]
+        entry["max"] = max(entry["max"], record["seconds"])
+    for entry in stages.values():
+        entry["mean"] = entry["total"] / entry["count"]
+    return sorted(stages.values(), key=lambda e: e["total"], reverse=True)
@@ -0,0 +1,125 @@
+import json
+import os
+from datetime import date
+
+import pytest
+
+from src.utils import network_capture_utils
+from src.utils.network_capture_utils import (
+    build_widget_rows,
+    date_columns,
+    date_split_widgets,
+    decode_data_response,
+    describe_captured_components,
+    match_components,
+    split_rows_by_date,
+    tables_from_response,
+)
+from src.utils.scraping_utils import COMPONENT_FIXTURE_DIR
+
+
+# ========== Regressionstests des batchedDataV2-Decoders ==========
+#
+# Eine Aufnahme enthält die rohen Anfragen/Antworten eines Tages, die
+# DOM-Zeilen derselben Tabellen und die Zuordnung Widget -> Komponente.
+# tests/fixtures/network_capture_sample.json ist ein Beispiel im Format der
+# Antworten (Werte aus den Rohdaten); mit --discover-components
+# mitgeschnittene Tage in src/data/fixtures/components laufen zusätzlich mit.
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "fixtures", "network_capture_sample.json")
+# Antwort über mehrere Tage mit Datums-Dimension an Position 0 (Zeitraum-Modus)
+RANGE_SAMPLE = os.path.join(os.path.dirname(__file__), "fixtures", "network_capture_range_sample.json")
+
+
+def _captures() -> list:
+    paths = [SAMPLE]
+    if os.path.isdir(COMPONENT_FIXTURE_DIR):
+        paths += [
+            os.path.join(COMPONENT_FIXTURE_DIR, name)
+            for name in sorted(os.listdir(COMPONENT_FIXTURE_DIR)) if name.endswith(".json")
+        ]
+    return paths
+
+
+def _load(path: str) -> tuple:
+    with open(path, encoding="utf-8") as f:
+        capture = json.load(f)
+    tables = {}
+    for response in capture["responses"]:
+        tables.update(tables_from_response(response["postData"], response["body"]))
+    return capture, tables
+
+
+@pytest.mark.parametrize("path", _captures(), ids=os.path.basename)
+def test_decoder_rebuilds_dom_rows(path):
+    capture, tables = _load(path)
+    assert capture["matches"], "Aufnahme ohne zugeordnete Widgets"
+    for widget, component_id in capture["matches"].items():
+        records = tables[component_id]
+        column = capture.get("date_columns", {}).get(widget)
+        if column is not None:
+            records = [values[:column] + values[column + 1:] for values in records]
+        rows = build_widget_rows(widget, records, capture["date"])
+        assert rows == capture["dom_rows"][widget]
+
+
+@pytest.mark.parametrize("path", _captures(), ids=os.path.basename)
+def test_components_are_matched_to_widgets(path):
+    capture, tables = _load(path)
+    day = date.fromisoformat(capture["date"])
+    assert match_components(tables, capture["dom_rows"], day) == capture["matches"]
+    assert date_columns(tables, capture["matches"], day) == capture.get("date_columns", {})
+
+
+def test_decoder_strips_xssi_prefix_and_keeps_empty_tables():
+    body = ")]}'\n" + json.dumps({"dataResponse": [
+        {"dataSubset": [{"dataset": {"tableDataset": {"column": [
+            {"stringColumn": {"values": ["a", "b"]}},
+            {"doubleColumn": {"values": [1, 2.5]}},
+        ]}}}]},
+        {"dataSubset": []},
+    ]})
+    assert decode_data_response(body) == [[["a", 1], ["b", 2.5]], []]
+
+
+def test_unmatched_widgets_are_reported(capsys):
+    _, tables = _load(SAMPLE)
+    describe_captured_components(tables, {"landingpage": "cd-sample-landingpage"})
+    out = capsys.readouterr().out
+    assert '"landingpage": \'cd-sample-landingpage\',' in out
+    assert "Ohne eindeutige Zuordnung: what_did_user_do, where_did_they_come_from" in out
+
+
+@pytest.fixture
+def range_capture(monkeypatch):
+    capture, tables = _load(RANGE_SAMPLE)
+    widget = capture["widget"]
+    monkeypatch.setitem(network_capture_utils.WIDGET_COMPONENTS, widget, capture["component"])
+    monkeypatch.setitem(network_capture_utils.WIDGET_DATE_COLUMNS, widget, capture["date_column"])
+    return capture, tables
+
+
+def test_range_mode_needs_configured_date_column(range_capture):
+    capture, _ = range_capture
+    assert date_split_widgets() == [capture["widget"]]
+
+
+def test_range_response_is_split_into_days(range_capture):
+    capture, tables = range_capture
+    days = [date.fromisoformat(day) for day in capture["days"]]
+    per_day = split_rows_by_date(tables, capture["widget"], days)
+    assert {day.isoformat(): rows for day, rows in per_day.items()} == capture["dom_rows"]
+
+
+def test_discovery_finds_date_column_of_single_day(range_capture):
+    capture, tables = range_capture
+    day = date.fromisoformat(capture["days"][0])
+    column = capture["date_column"]
+    single = {
+        cid: [values for values in records if values[column] == day.strftime("%Y%m%d")]
+        for cid, records in tables.items()
+    }
+    dom_rows = {capture["widget"]: capture["dom_rows"][day.isoformat()]}
+    matches = match_components(single, dom_rows, day)
+    assert matches == {capture["widget"]: capture["component"]}
+    assert date_columns(single, matches, day) == {capture["widget"]: column}
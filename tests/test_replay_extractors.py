@@ -0,0 +1,80 @@
+from datetime import date
+
+import pytest
+
+from src.utils.benchmark_utils import (
+    EXTRACTORS,
+    MAX_MS_PER_DAY,
+    benchmark_extractors,
+    check_extractors,
+    expected_rows,
+    load_recordings,
+    slow_extractors,
+)
+from src.utils.replay_utils import synthetic_recording
+from src.utils.table_engine_utils import TABLE_SPECS
+
+
+# ========== Regressionstests der Extractors ohne Browser ==========
+#
+# Die Tage werden aus den Rohdaten nachgebaut (synthetic_recording) bzw. aus
+# src/data/fixtures geladen, wenn dort aufgezeichnete Tage liegen. Jeder
+# Extractor muss genau die aufgezeichneten Zeilen liefern. Die Zeitgrenze
+# MAX_MS_PER_DAY läuft nur mit -m benchmark (Wanduhr, rechnerabhängig).
+
+SYNTHETIC_DAYS = 20
+
+
+@pytest.fixture(scope="module")
+def synthetic():
+    return load_recordings(synthetic_days=SYNTHETIC_DAYS)
+
+
+@pytest.fixture(scope="module")
+def recorded():
+    return load_recordings()
+
+
+@pytest.mark.parametrize("extractor", sorted(EXTRACTORS))
+def test_extractor_matches_raw_rows(synthetic, extractor):
+    assert synthetic, "Keine Rohdaten für synthetische Tage gefunden"
+    assert check_extractors(synthetic, {extractor: EXTRACTORS[extractor]}) == []
+
+
+@pytest.mark.parametrize("extractor", sorted(EXTRACTORS))
+def test_extractor_matches_recorded_fixtures(recorded, extractor):
+    if not any(expected_rows(recording, extractor) is not None for recording in recorded.values()):
+        pytest.skip("Keine aufgezeichneten Fixtures mit Sollwerten")
+    assert check_extractors(recorded, {extractor: EXTRACTORS[extractor]}) == []
+
+
+@pytest.mark.benchmark
+def test_extractors_within_time_limit(synthetic):
+    rounds = 2
+    results = benchmark_extractors(synthetic, rounds=rounds)
+    assert slow_extractors(results, len(synthetic), rounds, MAX_MS_PER_DAY) == []
+
+
+def test_broken_extractor_is_detected(synthetic):
+    spec = TABLE_SPECS["landingpage"]
+
+    def drops_last_row(driver, day):
+        return EXTRACTORS[spec.widget](driver, day)[:-1]
+
+    assert check_extractors(synthetic, {spec.widget: drops_last_row})
+
+
+def test_synthetic_recording_lists_expected_rows(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "who_was_visiting_chart.csv").write_text(
+        "\ufeffdatum;kategorie;wert\n2024-01-02;female;3\n2024-01-03;male;1\n", encoding="utf-8"
+    )
+    recording = synthetic_recording(date(2024, 1, 2), str(raw))
+    assert recording["rows"]["who_was_visiting_chart"] == [
+        {"datum": "2024-01-02", "kategorie": "female", "wert": "3"}
+    ]
+    assert check_extractors(
+        {date(2024, 1, 2): recording},
+        {"who_was_visiting_chart": EXTRACTORS["who_was_visiting_chart"]},
+    ) == []